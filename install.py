@@ -20,10 +20,8 @@ def main():
     requirements_file = skill_dir / "requirements.txt"
 
     if os.name == "nt":
-        venv_pip = venv_dir / "Scripts" / "pip.exe"
         venv_python = venv_dir / "Scripts" / "python.exe"
     else:
-        venv_pip = venv_dir / "bin" / "pip"
         venv_python = venv_dir / "bin" / "python"
 
     if venv_dir.exists():
@@ -35,16 +33,35 @@ def main():
     venv.create(venv_dir, with_pip=True)
     print("Virtual environment created.")
 
-    print("Upgrading pip ...")
-    subprocess.run([str(venv_pip), "install", "--upgrade", "pip"], check=True)
-
-    print("Installing dependencies from requirements.txt ...")
+    # WHY: one pip process upgrades pip and installs requirements, so the
+    # resolver only warms up once. `python -m pip` skips the wrapper exe.
+    # Progress output is dropped (errors still reach stderr) and bytecode is
+    # compiled afterwards on all cores instead of serially inside pip.
+    print("Upgrading pip and installing dependencies from requirements.txt ...")
+    pip_env = {
+        **os.environ,
+        "PIP_PROGRESS_BAR": "off",
+        "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+    }
     subprocess.run(
-        [str(venv_pip), "install", "-r", str(requirements_file)],
+        [
+            str(venv_python), "-m", "pip", "install", "--no-compile",
+            "--upgrade", "pip",
+            "-r", str(requirements_file),
+        ],
         check=True,
+        env=pip_env,
+        stdout=subprocess.DEVNULL,
+    )
+    subprocess.run(
+        [str(venv_python), "-m", "compileall", "-q", "-j", "0", str(venv_dir)],
+        check=False,
+        stdout=subprocess.DEVNULL,
     )
 
-    # WHY: patchright requires real Chrome (not Chromium) for reliable anti-detection
+    # WHY: patchright requires real Chrome (not Chromium) for reliable anti-detection.
+    # This cannot overlap the pip step: `-m patchright` needs the package that
+    # step installs, so the Chrome download always starts after it.
     print("Installing Google Chrome via patchright ...")
     try:
         subprocess.run(
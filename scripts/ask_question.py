@@ -10,7 +10,6 @@ See: https://github.com/microsoft/playwright/issues/36139
 import argparse
 import sys
 import time
-import re
 from pathlib import Path
 
 from patchright.sync_api import sync_playwright
@@ -20,7 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from auth_manager import AuthManager
 from notebook_manager import NotebookLibrary
-from config import QUERY_INPUT_SELECTORS, RESPONSE_SELECTORS
+from config import NOTEBOOKLM_URL_RE, QUERY_INPUT_SELECTORS, RESPONSE_SELECTORS
 from browser_utils import (
     BrowserFactory,
     StealthUtils,
@@ -86,7 +85,7 @@ def refresh_notebook_name_only(notebook_url: str, headless: bool = True, profile
         print("  Opening notebook for name refresh...")
         expect("Notebook page should load and expose a browser title")
         page.goto(notebook_url, wait_until="domcontentloaded")
-        page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=10000)
+        page.wait_for_url(NOTEBOOKLM_URL_RE, timeout=10000)
 
         detected_title = ""
         deadline = time.time() + 10
@@ -179,7 +178,7 @@ def ask_notebooklm(question: str, notebook_url: str, headless: bool = True, prof
 
         # Wait for NotebookLM
         expect("URL should remain under notebooklm.google.com")
-        page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=10000)
+        page.wait_for_url(NOTEBOOKLM_URL_RE, timeout=10000)
 
         # Refresh notebook name in library if page title changed.
         try:
@@ -8,23 +8,22 @@ Implements hybrid auth approach:
 See: https://github.com/microsoft/playwright/issues/36139
 """
 
-import json
+import os
 import time
 import argparse
-import shutil
-import re
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 
-from patchright.sync_api import sync_playwright, BrowserContext
+if TYPE_CHECKING:
+    from patchright.sync_api import BrowserContext
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import DATA_DIR
-from browser_utils import BrowserFactory
-from profile_manager import ProfileManager
+from config import DATA_DIR, NOTEBOOKLM_URL_RE
+from json_utils import read_json, write_json
+from profile_manager import ProfileManager, get_profile_manager
 from runtime_logging import (
     configure_runtime,
     debug_kv,
@@ -48,7 +47,7 @@ class AuthManager:
         Args:
             profile_id: Explicit profile. None → active profile.
         """
-        self.pm = ProfileManager()
+        self.pm = get_profile_manager()
 
         if profile_id:
             self.profile_id = profile_id
@@ -71,13 +70,52 @@ class AuthManager:
             self.browser_state_dir = None
             self.browser_profile_dir = None
 
-    def is_authenticated(self) -> bool:
-        """Check if valid authentication exists for the current profile"""
-        if not self.state_file or not self.state_file.exists():
+        # (state.json mtime_ns, parsed state) for get_storage_state_dict
+        self._storage_state_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
+    def _stat_state_file(self) -> Optional[os.stat_result]:
+        """Stat state.json once; None when there is no profile or no file."""
+        if not self.state_file:
+            return None
+        try:
+            return self.state_file.stat()
+        except FileNotFoundError:
+            return None
+
+    def get_storage_state_dict(self) -> Optional[Dict[str, Any]]:
+        """
+        Parsed state.json (cookies + origins) for new_context(storage_state=...).
+
+        Memoized on the file's mtime so parallel contexts share one parse,
+        while a re-auth that rewrites the file is still picked up.
+        """
+        state_stat = self._stat_state_file()
+        if state_stat is None:
+            return None
+        cached = self._storage_state_cache
+        if cached is not None and cached[0] == state_stat.st_mtime_ns:
+            return cached[1]
+        try:
+            state = read_json(self.state_file)
+        except (OSError, ValueError) as e:
+            log_exception("  Could not read browser state", e)
+            return None
+        self._storage_state_cache = (state_stat.st_mtime_ns, state)
+        return state
+
+    def is_authenticated(self, state_stat: Optional[os.stat_result] = None) -> bool:
+        """Check if valid authentication exists for the current profile
+
+        Args:
+            state_stat: Pre-fetched stat of state.json, to avoid a second syscall.
+        """
+        if state_stat is None:
+            state_stat = self._stat_state_file()
+        if state_stat is None:
             return False
 
         # Check if state file is not too old (7 days)
-        age_days = (time.time() - self.state_file.stat().st_mtime) / 86400
+        age_days = (time.time() - state_stat.st_mtime) / 86400
         if age_days > 7:
             print(f"Warning: Browser state is {age_days:.1f} days old, may need re-authentication")
 
@@ -85,23 +123,22 @@ class AuthManager:
 
     def get_auth_info(self) -> Dict[str, Any]:
         """Get authentication information for the current profile"""
+        state_stat = self._stat_state_file()
         info = {
             'profile_id': self.profile_id,
-            'authenticated': self.is_authenticated(),
+            'authenticated': self.is_authenticated(state_stat),
             'state_file': str(self.state_file) if self.state_file else None,
-            'state_exists': self.state_file.exists() if self.state_file else False,
+            'state_exists': state_stat is not None,
         }
 
         if self.auth_info_file and self.auth_info_file.exists():
             try:
-                with open(self.auth_info_file, 'r') as f:
-                    saved_info = json.load(f)
-                    info.update(saved_info)
+                info.update(read_json(self.auth_info_file))
             except Exception:
                 pass
 
-        if info['state_exists']:
-            age_hours = (time.time() - self.state_file.stat().st_mtime) / 3600
+        if state_stat is not None:
+            age_hours = (time.time() - state_stat.st_mtime) / 3600
             info['state_age_hours'] = age_hours
 
         return info
@@ -122,19 +159,20 @@ class AuthManager:
             return False
 
         step(f"Authentication setup for profile '{self.profile_id}'")
-        print(f"Starting authentication setup for profile '{self.profile_id}'...")
-        print(f"  Timeout: {timeout_minutes} minutes")
+        print(
+            f"Starting authentication setup for profile '{self.profile_id}'...\n"
+            f"  Timeout: {timeout_minutes} minutes"
+        )
         debug_kv("auth.setup", profile_id=self.profile_id, headless=headless, timeout_minutes=timeout_minutes)
 
-        playwright = None
-        context = None
+        # Deferred: patchright is only needed once a browser is launched
+        from browser_utils import BrowserFactory
 
-        try:
-            playwright = sync_playwright().start()
+        page = None
 
-            # Launch using factory with profile-specific paths
-            context = BrowserFactory.launch_persistent_context(
-                playwright,
+        try:
+            # Reuse the process-wide context for this profile when one is open
+            context = BrowserFactory.get_or_create(
                 headless=headless,
                 user_data_dir=str(self.browser_profile_dir),
                 state_file=self.state_file,
@@ -146,20 +184,23 @@ class AuthManager:
             page.goto("https://notebooklm.google.com", wait_until="domcontentloaded")
 
             # Check if already authenticated
-            if "notebooklm.google.com" in page.url and "accounts.google.com" not in page.url:
+            if self._is_notebooklm_home(page.url):
                 print("  Already authenticated!")
                 self._save_browser_state(context)
                 return True
 
             # Wait for manual login
-            print("\n  Please log in to your Google account...")
-            print(f"  Waiting up to {timeout_minutes} minutes for login...")
+            print(
+                "\n  Please log in to your Google account...\n"
+                f"  Waiting up to {timeout_minutes} minutes for login...",
+                flush=True,
+            )
 
             try:
                 # Wait for URL to change to NotebookLM (regex ensures it's the actual domain, not a parameter)
                 timeout_ms = int(timeout_minutes * 60 * 1000)
                 expect("URL should return to https://notebooklm.google.com/ after login")
-                page.wait_for_url(re.compile(r"^https://notebooklm\.google\.com/"), timeout=timeout_ms)
+                page.wait_for_url(NOTEBOOKLM_URL_RE, timeout=timeout_ms)
 
                 print(f"  Login successful!")
 
@@ -177,20 +218,14 @@ class AuthManager:
             return False
 
         finally:
-            # Clean up browser resources
-            if context:
-                try:
-                    context.close()
-                except Exception:
-                    pass
-
-            if playwright:
+            # The shared context stays open for later operations; only the tab is ours.
+            if page:
                 try:
-                    playwright.stop()
+                    page.close()
                 except Exception:
                     pass
 
-    def _save_browser_state(self, context: BrowserContext):
+    def _save_browser_state(self, context: "BrowserContext"):
         """Save browser state to disk"""
         try:
             # Save storage state (cookies, localStorage)
@@ -208,8 +243,7 @@ class AuthManager:
                 'authenticated_at': now,
                 'authenticated_at_iso': time.strftime('%Y-%m-%d %H:%M:%S')
             }
-            with open(self.auth_info_file, 'w') as f:
-                json.dump(info, f, indent=2)
+            write_json(self.auth_info_file, info)
             # Update profile registry
             self.pm.update_profile(self.profile_id, authenticated_at=now)
         except Exception:
@@ -230,21 +264,34 @@ class AuthManager:
         step(f"Clear auth state for profile '{self.profile_id}'")
 
         try:
-            # Remove browser state
-            if self.state_file and self.state_file.exists():
+            # Release Chrome's lock on the profile dir before deleting it.
+            # No shared context can exist unless browser_utils was imported.
+            browser_utils = sys.modules.get("browser_utils")
+            if browser_utils is not None:
+                browser_utils.BrowserFactory.close_shared()
+
+            # Remove browser state (EAFP: one syscall, no exists() race)
+            try:
                 self.state_file.unlink()
                 print("  Removed browser state")
+            except FileNotFoundError:
+                pass
 
             # Remove auth info
-            if self.auth_info_file and self.auth_info_file.exists():
+            try:
                 self.auth_info_file.unlink()
                 print("  Removed auth info")
+            except FileNotFoundError:
+                pass
 
             # Clear entire browser state directory
-            if self.browser_state_dir and self.browser_state_dir.exists():
+            import shutil
+            try:
                 shutil.rmtree(self.browser_state_dir)
-                self.browser_state_dir.mkdir(parents=True, exist_ok=True)
                 print("  Cleared browser data")
+            except FileNotFoundError:
+                pass
+            self.browser_state_dir.mkdir(parents=True, exist_ok=True)
 
             return True
 
@@ -286,15 +333,14 @@ class AuthManager:
         print(f"Validating authentication for profile '{self.profile_id}'...")
         step(f"Validate auth for profile '{self.profile_id}'")
 
-        playwright = None
-        context = None
+        # Deferred: patchright is only needed once a browser is launched
+        from browser_utils import BrowserFactory
 
-        try:
-            playwright = sync_playwright().start()
+        page = None
 
-            # Launch using factory with profile-specific paths
-            context = BrowserFactory.launch_persistent_context(
-                playwright,
+        try:
+            # Reuse the process-wide context for this profile when one is open
+            context = BrowserFactory.get_or_create(
                 headless=True,
                 user_data_dir=str(self.browser_profile_dir),
                 state_file=self.state_file,
@@ -306,7 +352,7 @@ class AuthManager:
             page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
 
             # Check if we can access NotebookLM
-            if "notebooklm.google.com" in page.url and "accounts.google.com" not in page.url:
+            if self._is_notebooklm_home(page.url):
                 print("  Authentication is valid")
                 self.pm.update_profile(self.profile_id, last_validated=time.time())
                 return True
@@ -319,17 +365,82 @@ class AuthManager:
             return False
 
         finally:
-            if context:
-                try:
-                    context.close()
-                except Exception:
-                    pass
-            if playwright:
+            if page:
                 try:
-                    playwright.stop()
+                    page.close()
                 except Exception:
                     pass
 
+    async def validate_auth_async(self, context) -> bool:
+        """
+        Async variant of validate_auth so several profiles can be checked at once.
+
+        Runs in a caller-supplied storage_state context (see
+        BrowserFactory.launch_ephemeral_contexts_async) and leaves closing it
+        to the caller. Unlike validate_auth, this does not write last_validated:
+        concurrent ProfileManager saves would clobber each other.
+
+        Args:
+            context: Async browser context loaded with this profile's state.json
+
+        Returns:
+            True if authentication is valid
+        """
+        step(f"Validate auth for profile '{self.profile_id}' (async)")
+
+        try:
+            page = await context.new_page()
+            await page.goto("https://notebooklm.google.com", wait_until="domcontentloaded", timeout=30000)
+
+            if self._is_notebooklm_home(page.url):
+                print(f"  [{self.profile_id}] Authentication is valid")
+                return True
+            print(f"  [{self.profile_id}] Authentication is invalid (redirected to login)")
+            return False
+
+        except Exception as e:
+            log_exception(f"  [{self.profile_id}] Validation failed", e)
+            return False
+
+    @staticmethod
+    def _is_notebooklm_home(url: str) -> bool:
+        """True when the page stayed on NotebookLM instead of bouncing to Google login."""
+        return "notebooklm.google.com" in url and "accounts.google.com" not in url
+
+
+async def _validate_profiles_async(profile_ids: List[str]) -> List[bool]:
+    """Validate several profiles concurrently in one shared Chrome process."""
+    import asyncio
+    from patchright.async_api import async_playwright
+    from browser_utils import BrowserFactory
+
+    results = [False] * len(profile_ids)
+    ready = []
+    for i, profile_id in enumerate(profile_ids):
+        auth = AuthManager(profile_id=profile_id)
+        if auth.is_authenticated():
+            ready.append((i, auth))
+        else:
+            print(f"  [{profile_id}] Not authenticated")
+    if not ready:
+        return results
+
+    async with async_playwright() as playwright:
+        browser, contexts = await BrowserFactory.launch_ephemeral_contexts_async(
+            playwright,
+            [auth.state_file for _, auth in ready],
+        )
+        try:
+            checks = await asyncio.gather(
+                *(auth.validate_auth_async(ctx) for (_, auth), ctx in zip(ready, contexts))
+            )
+        finally:
+            await browser.close()
+
+    for (i, _), valid in zip(ready, checks):
+        results[i] = valid
+    return results
+
 
 def main():
     """Command-line interface for authentication management"""
@@ -356,6 +467,9 @@ def main():
     validate_parser = subparsers.add_parser('validate', help='Validate authentication works')
     validate_parser.add_argument('--profile', help='Validate a specific profile (default: active)')
 
+    # Validate-all command
+    subparsers.add_parser('validate-all', help='Validate all profiles concurrently')
+
     # Clear command
     clear_parser = subparsers.add_parser('clear', help='Clear authentication for a profile')
     clear_parser.add_argument('--profile', help='Clear a specific profile (default: active)')
@@ -405,8 +519,7 @@ def main():
             profile_id = entry["id"]
         auth = AuthManager(profile_id=profile_id)
         if auth.setup_auth(headless=args.headless, timeout_minutes=args.timeout):
-            print("\nAuthentication setup complete!")
-            print("You can now use ask_question.py to query NotebookLM")
+            print("\nAuthentication setup complete!\nYou can now use ask_question.py to query NotebookLM")
         else:
             print("\nAuthentication setup failed")
             exit(1)
@@ -432,6 +545,27 @@ def main():
             print("Authentication is invalid or expired")
             print("Run: auth_manager.py reauth")
 
+    elif args.command == 'validate-all':
+        step("Validate all profiles concurrently")
+        import asyncio
+        pm = get_profile_manager()
+        profile_ids = [p["id"] for p in pm.profiles]
+        if not profile_ids:
+            print("No profiles. Create one with: auth_manager.py setup --name <name>")
+            return
+        print(f"Validating {len(profile_ids)} profile(s)...")
+        results = asyncio.run(_validate_profiles_async(profile_ids))
+        now = time.time()
+        lines = []
+        for profile_id, valid in zip(profile_ids, results):
+            if valid:
+                pm.update_profile(profile_id, last_validated=now)
+            lines.append(f"  {profile_id}: {'valid' if valid else 'invalid or expired'}")
+        if not all(results):
+            lines.append("Run: auth_manager.py reauth --profile <id>")
+        # One write, so the summary is not interleaved with late browser output
+        print("\n".join(lines))
+
     elif args.command == 'clear':
         step("Clear authentication artifacts")
         auth = AuthManager(profile_id=getattr(args, 'profile', None))
@@ -1,13 +1,23 @@
 """Browser helpers for NotebookLM skill workflows."""
 
-import json
+import atexit
+import contextlib
+import os
+import sys
 import time
 import random
 from pathlib import Path
-from typing import Optional, List, Sequence, Tuple, Union
+from typing import Dict, Optional, List, Sequence, Tuple, Union
 
 from patchright.sync_api import Playwright, BrowserContext, Page
-from config import BROWSER_ARGS, QUERY_INPUT_SELECTORS, USER_AGENT
+from config import (
+    ADD_SOURCE_DIALOG_SELECTOR,
+    BROWSER_ARGS,
+    LIGHTWEIGHT_BROWSER_ARGS,
+    QUERY_INPUT_SELECTORS,
+    USER_AGENT,
+)
+from json_utils import read_json
 from runtime_logging import debug, debug_kv, expect, log_exception, step
 
 
@@ -23,6 +33,16 @@ def _selector_reason(exc: Optional[BaseException]) -> str:
     return message or type(exc).__name__
 
 
+def any_visible(selectors: Sequence[str]) -> str:
+    """One selector matching a visible element of any in selectors.
+
+    Waits on a plain comma-joined selector only check its first match, so a
+    hidden earlier element would hide a visible later one; :visible on each
+    alternative avoids that.
+    """
+    return ", ".join(f"{sel}:visible" for sel in selectors)
+
+
 def log_selector_attempt(
     context: str,
     selector: str,
@@ -253,15 +273,173 @@ def get_latest_text_from_selectors(
     return None, None
 
 
+class _FastInspect:
+    """Stand-in for the `inspect` module as seen by patchright's connection layer."""
+
+    def __init__(self, real_inspect):
+        self._real = real_inspect
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+    def stack(self, context: int = 1):
+        """
+        Walk frames without inspect.getframeinfo().
+
+        inspect.stack() resolves source files and positions for every frame on
+        every API call; patchright only needs frame, filename, lineno and
+        function, which come straight off the frame object.
+        """
+        frame_info = self._real.FrameInfo
+        frames = []
+        frame = sys._getframe(1)
+        while frame is not None:
+            code = frame.f_code
+            frames.append(frame_info(frame, code.co_filename, frame.f_lineno, code.co_name, None, None))
+            frame = frame.f_back
+        return frames
+
+
+@contextlib.contextmanager
+def skip_api_stack_capture():
+    """
+    While the block runs, replace patchright's per-call inspect.stack() with a cheap frame walk.
+
+    Error messages still name the API that failed; only source-line lookups
+    are skipped. The stock module is put back on exit, so Playwright calls
+    outside the block keep full stack capture. Set PW_INSPECT_STACK=1 to
+    keep the stock behaviour inside it too.
+    """
+    try:
+        from patchright._impl import _connection
+    except ImportError:
+        _connection = None
+    if (
+        _connection is None
+        or os.environ.get("PW_INSPECT_STACK", "0") == "1"
+        or isinstance(_connection.inspect, _FastInspect)  # already inside one
+    ):
+        yield
+        return
+
+    original = _connection.inspect
+    _connection.inspect = _FastInspect(original)
+    debug("Patched patchright API stack capture")
+    try:
+        yield
+    finally:
+        _connection.inspect = original
+
+
 class BrowserFactory:
     """Factory for creating configured browser contexts"""
 
+    # Process-wide Playwright driver and persistent context reused by get_or_create().
+    _shared_playwright: Optional[Playwright] = None
+    _shared_context: Optional[BrowserContext] = None
+    _shared_key: Optional[Tuple[str, bool, Tuple[str, ...]]] = None
+
+    @classmethod
+    def get_or_create(
+        cls,
+        headless: bool = True,
+        user_data_dir: Optional[str] = None,
+        state_file: Optional[Path] = None,
+        extra_args: Optional[List[str]] = None,
+    ) -> BrowserContext:
+        """
+        Return the shared persistent context, launching it on first use.
+
+        The context is reused while user_data_dir, headless and extra_args match, so several
+        operations in one CLI invocation pay Chrome startup only once. Callers
+        should close the pages they open, not the context; it is closed at exit
+        or by close_shared().
+
+        Args:
+            headless: Run headless
+            user_data_dir: Chrome profile directory. If None, resolves from active profile.
+            state_file: Path to state.json for cookie injection. If None, resolves from active profile.
+            extra_args: Chrome flags appended to BROWSER_ARGS for this launch.
+        """
+        user_data_dir, state_file = cls._resolve_profile_paths(user_data_dir, state_file)
+
+        key = (str(user_data_dir), headless, tuple(extra_args or ()))
+        if cls._shared_context is not None and cls._shared_key == key:
+            debug_kv("browser.shared_context", action="reuse", user_data_dir=key[0], headless=headless)
+            return cls._shared_context
+
+        # A different profile or display mode needs its own Chrome process.
+        cls._close_shared_context()
+
+        if cls._shared_playwright is None:
+            from patchright.sync_api import sync_playwright
+            cls._shared_playwright = sync_playwright().start()
+            atexit.register(cls.close_shared)
+
+        debug_kv("browser.shared_context", action="launch", user_data_dir=key[0], headless=headless)
+        context = cls.launch_persistent_context(
+            cls._shared_playwright,
+            headless=headless,
+            user_data_dir=user_data_dir,
+            state_file=state_file,
+            extra_args=extra_args,
+        )
+        # Forget the context if Chrome goes away (e.g. the user closes the window).
+        context.on("close", lambda _: cls._forget_shared_context(context))
+        cls._shared_context = context
+        cls._shared_key = key
+        return context
+
+    @classmethod
+    def _resolve_profile_paths(
+        cls,
+        user_data_dir: Optional[str],
+        state_file: Optional[Path],
+    ) -> Tuple[str, Path]:
+        """Fill in missing paths from the active profile."""
+        if user_data_dir is None or state_file is None:
+            from profile_manager import get_profile_manager
+            paths = get_profile_manager().get_active_paths()
+            if user_data_dir is None:
+                user_data_dir = str(paths["browser_profile_dir"])
+            if state_file is None:
+                state_file = paths["state_file"]
+        return user_data_dir, state_file
+
+    @classmethod
+    def close_shared(cls) -> None:
+        """Close the shared context and stop the shared Playwright driver."""
+        cls._close_shared_context()
+        if cls._shared_playwright is not None:
+            try:
+                cls._shared_playwright.stop()
+            except Exception:
+                pass
+            cls._shared_playwright = None
+
+    @classmethod
+    def _close_shared_context(cls) -> None:
+        context = cls._shared_context
+        cls._forget_shared_context(context)
+        if context is not None:
+            try:
+                context.close()
+            except Exception:
+                pass
+
+    @classmethod
+    def _forget_shared_context(cls, context: Optional[BrowserContext]) -> None:
+        if cls._shared_context is context:
+            cls._shared_context = None
+            cls._shared_key = None
+
     @staticmethod
     def launch_persistent_context(
         playwright: Playwright,
         headless: bool = True,
         user_data_dir: Optional[str] = None,
         state_file: Optional[Path] = None,
+        extra_args: Optional[List[str]] = None,
     ) -> BrowserContext:
         """
         Launch a persistent browser context with anti-detection features
@@ -272,44 +450,168 @@ class BrowserFactory:
             headless: Run headless
             user_data_dir: Chrome profile directory. If None, resolves from active profile.
             state_file: Path to state.json for cookie injection. If None, resolves from active profile.
+            extra_args: Chrome flags appended to BROWSER_ARGS for this launch.
         """
-        if user_data_dir is None or state_file is None:
-            from profile_manager import ProfileManager
-            pm = ProfileManager()
-            paths = pm.get_active_paths()
-            if user_data_dir is None:
-                user_data_dir = str(paths["browser_profile_dir"])
-            if state_file is None:
-                state_file = paths["state_file"]
+        user_data_dir, state_file = BrowserFactory._resolve_profile_paths(user_data_dir, state_file)
 
         # Launch persistent context
         context = playwright.chromium.launch_persistent_context(
-            user_data_dir=user_data_dir,
-            channel="chrome",  # Use real Chrome
-            headless=headless,
-            no_viewport=True,
-            ignore_default_args=["--enable-automation"],
-            user_agent=USER_AGENT,
-            args=BROWSER_ARGS
+            **BrowserFactory._persistent_context_options(user_data_dir, headless, extra_args)
         )
 
         # Cookie workaround for Playwright bug #36139.
         # Session cookies (expires=-1) don't persist in user_data_dir automatically
-        BrowserFactory._inject_cookies(context, state_file)
+        BrowserFactory._inject_cookies(context, state_file, user_data_dir)
 
         return context
 
     @staticmethod
-    def _inject_cookies(context: BrowserContext, state_file: Path):
+    async def launch_browser_async(playwright, headless: bool = True):
+        """
+        Launch a plain (non-persistent) Chrome for storage_state contexts.
+
+        Contexts are cheap compared to browser processes, so checks that only
+        need a profile's cookies (not its fingerprint) share one Chrome.
+        Interactive auth keeps using the persistent profile instead.
+
+        Args:
+            playwright: Async Playwright instance
+            headless: Run headless
+        """
+        return await playwright.chromium.launch(
+            channel="chrome",
+            headless=headless,
+            ignore_default_args=["--enable-automation"],
+            args=BROWSER_ARGS,
+        )
+
+    @staticmethod
+    async def new_storage_context_async(browser, storage_state: Union[Path, Dict, None]):
+        """
+        Open a lightweight context on a shared browser, seeded from state.json.
+
+        Args:
+            browser: Browser from launch_browser_async
+            storage_state: Parsed state dict (reused as-is) or state.json path;
+                a missing file gives an empty context
+        """
+        if isinstance(storage_state, dict):
+            return await browser.new_context(storage_state=storage_state, user_agent=USER_AGENT)
+        if storage_state is not None and not Path(storage_state).exists():
+            storage_state = None
+        return await browser.new_context(
+            storage_state=str(storage_state) if storage_state is not None else None,
+            user_agent=USER_AGENT,
+        )
+
+    @staticmethod
+    async def launch_ephemeral_contexts_async(playwright, state_files: List[Path]):
+        """
+        Launch one headless Chrome and open a storage_state context per file.
+
+        Args:
+            playwright: Async Playwright instance
+            state_files: state.json paths, one context each
+
+        Returns:
+            (browser, contexts) — closing the browser closes every context
+        """
+        browser = await BrowserFactory.launch_browser_async(playwright)
+        try:
+            contexts = [
+                await BrowserFactory.new_storage_context_async(browser, state_file)
+                for state_file in state_files
+            ]
+        except Exception:
+            await browser.close()
+            raise
+        return browser, contexts
+
+    @staticmethod
+    def _persistent_context_options(
+        user_data_dir: str,
+        headless: bool,
+        extra_args: Optional[List[str]] = None,
+    ) -> dict:
+        """Launch options for a persistent Chrome context on this profile."""
+        return {
+            "user_data_dir": user_data_dir,
+            "channel": "chrome",  # Use real Chrome
+            "headless": headless,
+            "no_viewport": True,
+            "ignore_default_args": ["--enable-automation"],
+            "user_agent": USER_AGENT,
+            "args": BROWSER_ARGS + list(extra_args or ()),
+        }
+
+    @staticmethod
+    def _inject_cookies(
+        context: BrowserContext,
+        state_file: Path,
+        user_data_dir: Optional[str] = None,
+    ):
         """Inject cookies from state.json if available"""
-        if state_file.exists():
+        cookies = BrowserFactory._load_state_cookies(state_file, user_data_dir)
+        if cookies:
+            cookies = BrowserFactory._missing_cookies(cookies, context.cookies())
+        if cookies:
+            context.add_cookies(cookies)
+
+    @staticmethod
+    def _missing_cookies(cookies: List[dict], existing: List[dict]) -> List[dict]:
+        """Drop cookies the context already holds with the same value."""
+        def key(c: dict) -> Tuple:
+            return (c.get('name'), c.get('domain'), c.get('path', '/'), c.get('value'))
+
+        have = {key(c) for c in existing}
+        missing = [c for c in cookies if key(c) not in have]
+        debug_kv("browser.cookies", requested=len(cookies), already_present=len(cookies) - len(missing))
+        return missing
+
+    @staticmethod
+    def _load_state_cookies(
+        state_file: Optional[Path],
+        user_data_dir: Optional[str] = None,
+    ) -> List[dict]:
+        """Read the cookies to inject from state.json; empty when missing or unreadable.
+
+        When Chrome's own cookie store was written after state.json, its
+        persistent cookies are at least as fresh, so only the session cookies
+        (which Chrome never persists) are injected.
+        """
+        try:
+            state_mtime = state_file.stat().st_mtime if state_file else None
+        except FileNotFoundError:
+            state_mtime = None
+        if state_mtime is None:
+            return []
+
+        try:
+            # state.json also carries localStorage blobs; parse it with orjson when present
+            cookies = read_json(state_file).get('cookies') or []
+        except Exception as e:
+            log_exception("  Warning: Could not load state.json", e)
+            return []
+
+        db_mtime = BrowserFactory._cookie_db_mtime(user_data_dir)
+        if db_mtime is not None and db_mtime > state_mtime:
+            cookies = [c for c in cookies if c.get('expires', -1) == -1]
+            debug_kv("browser.cookies", source="state.json", mode="session_only", count=len(cookies))
+        return cookies
+
+    @staticmethod
+    def _cookie_db_mtime(user_data_dir: Optional[str]) -> Optional[float]:
+        """mtime of the profile's Cookies SQLite DB, or None if it does not exist yet."""
+        if not user_data_dir:
+            return None
+        profile = Path(user_data_dir) / "Default"
+        # Chrome 96+ keeps cookies under Network/; older builds at the profile root
+        for db in (profile / "Network" / "Cookies", profile / "Cookies"):
             try:
-                with open(state_file, 'r') as f:
-                    state = json.load(f)
-                    if 'cookies' in state and len(state['cookies']) > 0:
-                        context.add_cookies(state['cookies'])
-            except Exception as e:
-                log_exception("  Warning: Could not load state.json", e)
+                return db.stat().st_mtime
+            except FileNotFoundError:
+                continue
+        return None
 
 
 class StealthUtils:
@@ -401,11 +703,16 @@ class StealthUtils:
         cps_min = max(1.0, (wpm_min * 5) / 60.0)
         cps_max = max(cps_min, (wpm_max * 5) / 60.0)
 
-        # Type
-        for char in text:
+        # Type in a few chunks: Playwright applies the per-key delay browser-side,
+        # so each chunk is one round-trip. Chunk breaks keep the occasional pause.
+        chunk_start = 0
+        for i in range(1, len(text) + 1):
+            if i < len(text) and random.random() >= 0.05:
+                continue
             delay_ms = random.uniform(1000 / cps_max, 1000 / cps_min)
-            element.type(char, delay=delay_ms)
-            if random.random() < 0.05:
+            element.type(text[chunk_start:i], delay=delay_ms)
+            chunk_start = i
+            if i < len(text):
                 time.sleep(random.uniform(0.15, 0.4))
 
         return resolved_selector
@@ -485,18 +792,9 @@ class StealthUtils:
     ) -> Tuple[Optional[object], Optional[str]]:
         """Resolve a single selector or selector list to an element and winner."""
         if isinstance(selector, str):
-            log_selector_attempt(context, selector, action="query_selector")
-            element = page.query_selector(selector)
-            if element:
-                log_selector_attempt(
-                    context,
-                    selector,
-                    action="query_selector",
-                    success=True,
-                    reason="matched",
-                )
-                return element, selector
-
+            # wait_for_selector returns at once when the element is already
+            # visible, so no separate query_selector probe is needed.
+            log_selector_attempt(context, selector, action="wait_for_selector", timeout=timeout, state="visible")
             try:
                 element = page.wait_for_selector(selector, timeout=timeout, state="visible")
             except Exception as exc:
@@ -524,13 +822,29 @@ class StealthUtils:
                 return element, selector
             return None, None
 
-        return wait_for_first_selector(
-            page,
-            list(selector),
-            context=context,
-            timeout=timeout,
-            state="visible",
-        )
+        # Wait once for any visible candidate, then pick the winner in priority
+        # order with instant probes, so a miss costs one timeout rather than one
+        # per selector. Each alternative carries :visible because the wait only
+        # checks the first element the combined selector matches.
+        selectors = list(selector)
+        combined = any_visible(selectors)
+        log_selector_attempt(context, combined, action="wait_for_selector", timeout=timeout, state="visible")
+        try:
+            page.wait_for_selector(combined, timeout=timeout, state="visible")
+        except Exception as exc:
+            log_selector_attempt(
+                context,
+                combined,
+                action="wait_for_selector",
+                success=False,
+                reason=_selector_reason(exc),
+                timeout=timeout,
+                state="visible",
+            )
+            return None, None
+
+        resolved_selector, element = find_first_visible_selector(page, selectors, context=context)
+        return element, resolved_selector
 
 
 # ------------------------------------------------------------------ #
@@ -554,7 +868,6 @@ def add_source_web(
     Returns:
         True on success, False on failure
     """
-    from patchright.sync_api import sync_playwright
     from auth_manager import AuthManager
 
     step("Add web source through NotebookLM browser flow")
@@ -563,62 +876,87 @@ def add_source_web(
         print("Error: Not authenticated. Run auth_manager.py setup first.")
         return False
 
-    playwright = None
-    context = None
+    page = None
 
     try:
-        playwright = sync_playwright().start()
-        context = BrowserFactory.launch_persistent_context(
-            playwright,
+        context = BrowserFactory.get_or_create(
             headless=headless,
             user_data_dir=str(auth.browser_profile_dir),
             state_file=auth.state_file,
+            # Submitting a URL needs no images, translation or media routing
+            extra_args=LIGHTWEIGHT_BROWSER_ARGS,
         )
         page = context.new_page()
         page.set_viewport_size({"width": 1440, "height": 900})
 
         print("  Navigating to notebook...")
         expect("Notebook page should load and show the add-source action")
-        page.goto(notebook_url, wait_until="domcontentloaded")
-        page.wait_for_timeout(5000)
+        # Return as soon as navigation commits; the add button is the real readiness signal
+        page.goto(notebook_url, wait_until="commit")
 
         # Open the add-sources dialog
-        add_btn_sel = 'button[aria-label="Thêm nguồn"]'
-        page.wait_for_selector(add_btn_sel, timeout=15000)
-        page.click(add_btn_sel)
-        page.wait_for_timeout(1500)
+        add_btn = page.locator('button[aria-label="Thêm nguồn"]')
+        add_btn.wait_for(state="visible", timeout=15000)
+        add_btn.click()
         print("  Opened add-source dialog")
 
         # Click the "Trang web" (Website) option inside the dialog
-        web_btn = page.query_selector('button:has-text("Trang web")')
+        web_btn_sel = 'button:has-text("Trang web")'
+        try:
+            web_btn = page.wait_for_selector(web_btn_sel, timeout=5000, state="visible")
+        except Exception as exc:
+            debug(f"Website option did not appear: {_selector_reason(exc)}")
+            web_btn = None
         if not web_btn:
             print("  Error: 'Trang web' button not found in dialog")
             return False
         web_btn.click()
-        page.wait_for_timeout(1500)
         print("  Clicked 'Trang web'")
 
-        # Fill URL into the query box textarea
+        # Fill URL into the dialog's textarea. The lookup is scoped to the
+        # dialog so the notebook's own chat box can never receive the URL.
+        dialog = page.locator(ADD_SOURCE_DIALOG_SELECTOR)
         url_input_selectors = [
             'textarea[aria-label="Hộp truy vấn"]',
             *QUERY_INPUT_SELECTORS,
         ]
-        url_selector, _ = find_first_visible_selector(
-            page,
-            url_input_selectors,
-            context="add_source.url_input",
-        )
+        any_url_input = any_visible(url_input_selectors)
+        log_selector_attempt("add_source.url_input", any_url_input, action="wait_for")
+        try:
+            dialog.locator(any_url_input).first.wait_for(state="visible", timeout=5000)
+        except Exception as exc:
+            log_selector_attempt(
+                "add_source.url_input",
+                any_url_input,
+                action="wait_for",
+                success=False,
+                reason=_selector_reason(exc),
+            )
+            print("  Error: URL input textarea not found")
+            return False
 
-        if not url_selector:
+        # Something is visible now; take the highest-priority visible match
+        url_selector, url_handle = None, None
+        for selector in url_input_selectors:
+            candidate = dialog.locator(f"{selector}:visible")
+            if candidate.count():
+                url_selector = selector
+                url_handle = candidate.first.element_handle()
+                break
+        if not url_handle:
             print("  Error: URL input textarea not found")
             return False
 
-        page.fill(url_selector, source_url)
+        url_handle.fill(source_url)
         debug(f"Filled source URL with selector: {url_selector}")
-        print(f"  Filled URL via: {url_selector}")
+        print("  Filled URL input")
 
-        page.keyboard.press("Enter")
-        page.wait_for_timeout(3000)
+        url_handle.press("Enter")
+        # The dialog closes once NotebookLM accepts the URL
+        try:
+            url_handle.wait_for_element_state("hidden", timeout=10000)
+        except Exception as exc:
+            debug(f"URL input still visible after submit: {_selector_reason(exc)}")
         print(f"  Source submitted: {source_url}")
         return True
 
@@ -627,13 +965,9 @@ def add_source_web(
         return False
 
     finally:
-        if context:
-            try:
-                context.close()
-            except Exception:
-                pass
-        if playwright:
+        # The shared context stays open for later operations; only the tab is ours.
+        if page:
             try:
-                playwright.stop()
+                page.close()
             except Exception:
                 pass
@@ -4,13 +4,15 @@ Notebook Link Validator for NotebookLM
 Checks if notebook links in the library are active and accessible.
 """
 
+import asyncio
+import io
+import re
 import sys
-import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
-from patchright.sync_api import sync_playwright, Page
+from patchright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -18,11 +20,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 from config import (
     QUERY_INPUT_SELECTORS, 
     LOGIN_TIMEOUT_MINUTES,
-    USER_AGENT
+    USER_AGENT,
+    VALIDATION_DB_NAME,
 )
-from browser_utils import BrowserFactory, find_first_visible_selector
+from browser_utils import BrowserFactory, any_visible
 from auth_manager import AuthManager
 from notebook_manager import NotebookLibrary
+from validation_store import ValidationStore
 from runtime_logging import (
     configure_runtime,
     debug,
@@ -34,116 +38,373 @@ from runtime_logging import (
 )
 
 
+# All query-input fallbacks in one selector, so a single wait covers every variant
+QUERY_INPUT_SELECTOR = any_visible(QUERY_INPUT_SELECTORS)
+
+# Page texts that mean the notebook is gone or not shared with this account
+ERROR_TEXTS = ("Notebook not found", "You need access")
+
+# One alternation, so the page text is scanned once however many texts there are;
+# PAGE_PROBE_JS matches it case-insensitively in the page
+ERROR_TEXT_PATTERN = "|".join(re.escape(text) for text in ERROR_TEXTS)
+
+# Title and error-text presence in a single CDP round-trip
+PAGE_PROBE_JS = """errorPattern => {
+  const text = document.body ? document.body.innerText : '';
+  return {
+    title: document.title,
+    hasError: new RegExp(errorPattern, 'i').test(text),
+  };
+}"""
+
+# Notebooks loading at once; each gets its own context in one shared browser
+MAX_PARALLEL = 5
+
+# Workers classifying loaded pages; probes are one short CDP round-trip each
+PROBE_WORKERS = 2
+
+NOTEBOOKLM_HOME = "https://notebooklm.google.com/"
+
+# Requests that never affect whether the query input renders
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+
+# Notebooks verified active within this window are not re-checked (see --max-age-hours)
+DEFAULT_MAX_AGE_HOURS = 24
+
+
+def _is_home_url(url: str) -> bool:
+    """True for the NotebookLM home page, with or without a query string."""
+    return url == NOTEBOOKLM_HOME or url.startswith(NOTEBOOKLM_HOME + "?")
+
+
+async def _block_heavy_requests(route):
+    """Abort requests the validator never looks at; let the rest through."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or "analytics" in request.url:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
 class NotebookValidator:
     """Validates notebook links against NotebookLM"""
 
-    def __init__(self, profile_id=None):
-        """Initialize validator"""
+    def __init__(
+        self,
+        profile_id=None,
+        max_parallel: int = MAX_PARALLEL,
+        max_age_hours: float = DEFAULT_MAX_AGE_HOURS,
+        force: bool = False,
+    ):
+        """Initialize validator
+
+        Args:
+            profile_id: Profile to use. None = active profile.
+            max_parallel: Maximum notebooks checked at once.
+            max_age_hours: Reuse an 'active' result younger than this. 0 disables reuse.
+            force: Re-check every notebook regardless of its last result.
+        """
         self.library = NotebookLibrary(profile_id=profile_id)
         self.auth = AuthManager(profile_id=profile_id)
+        self.max_parallel = max(1, max_parallel)
+        self.max_age = timedelta(hours=max_age_hours)
+        self.force = force
         self.results = {}
 
+        # Check results live beside library.json, not inside it
+        self.store_path = self.library.data_dir / VALIDATION_DB_NAME
+        with ValidationStore(self.store_path) as store:
+            self.last_checks = store.load()
+
+    def _last_check(self, notebook_id: str, notebook: Dict[str, Any]) -> Dict[str, Any]:
+        """Latest stored result, falling back to fields older runs wrote into library.json."""
+        stored = self.last_checks.get(notebook_id)
+        if stored is not None:
+            return stored
+        return {
+            'status': notebook.get('last_check_status'),
+            'reason': notebook.get('last_check_reason'),
+            'checked_at': notebook.get('last_checked'),
+        }
+
+    def _is_cache_fresh(self, last_check: Dict[str, Any]) -> bool:
+        """True when the notebook was verified active within max_age."""
+        if self.force or self.max_age <= timedelta(0):
+            return False
+        if last_check.get('status') != 'active':
+            return False
+        try:
+            checked_at = datetime.fromisoformat(last_check['checked_at'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return datetime.now() - checked_at < self.max_age
+
     def validate_all(self):
         """Validate all notebooks in the library"""
+        to_check = self._select_notebooks()
+        if to_check is None:
+            return
+        if to_check and not asyncio.run(self._validate_notebooks(to_check)):
+            return
+        self._finish()
+
+    async def validate_all_async(self, browser=None):
+        """validate_all for callers already inside an event loop.
+
+        Args:
+            browser: Browser from BrowserFactory.launch_browser_async to reuse;
+                it is left open. None launches (and closes) a private one.
+        """
+        to_check = self._select_notebooks()
+        if to_check is None:
+            return
+        if to_check and not await self._validate_notebooks(to_check, browser):
+            return
+        self._finish()
+
+    def _select_notebooks(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Record cached results and return the notebooks that need a browser check.
+
+        Returns:
+            None when there is nothing to do or the user declined to continue
+        """
         step("Validate all registered notebook links")
         notebooks = self.library.notebooks
         if not notebooks:
             print("No notebooks in library to validate.")
-            return
+            return None
 
         print(f"Found {len(notebooks)} notebooks. Starting validation...")
+
+        # Reuse recent 'active' results; only stale or failing notebooks hit the browser
+        to_check = {}
+        for notebook_id, notebook in notebooks.items():
+            last_check = self._last_check(notebook_id, notebook)
+            if self._is_cache_fresh(last_check):
+                self.results[notebook_id] = {
+                    'status': 'active',
+                    'reason': f"Cached (verified {last_check['checked_at']})",
+                    'cached': True,
+                }
+            else:
+                to_check[notebook_id] = notebook
+        if len(to_check) < len(notebooks):
+            print(f"Reusing {len(notebooks) - len(to_check)} recent result(s); use --force to re-check.")
         
         # Check authentication first
-        if not self.auth.is_authenticated():
+        if to_check and not self.auth.is_authenticated():
             print("Warning: valid authentication not found. Validation may fail.")
             print("Run '.\\run.bat auth_manager.py setup' to login first.")
             # Continue anyway as some notebooks might be public (though rare for NotebookLM)
             # Actually, NotebookLM usually requires login even for shared ones.
             response = input("Continue without verified auth? (y/n): ")
             if response.lower() != 'y':
-                return
-
-        with sync_playwright() as p:
-            # Launch browser with profile-specific paths
-            context = BrowserFactory.launch_persistent_context(
-                p,
-                headless=True,
-                user_data_dir=str(self.auth.browser_profile_dir),
-                state_file=self.auth.state_file,
-            )
-            page = context.new_page()
-            
+                return None
+
+        return to_check
+
+    def _finish(self):
+        """Report and persist results once every check has landed."""
+        # Tasks finish in any order; report in library order
+        notebooks = self.library.notebooks
+        self.results = {nid: self.results[nid] for nid in notebooks if nid in self.results}
+
+        self._print_report()
+        self._update_library()
+
+    async def _validate_notebooks(self, notebooks: Dict[str, Dict[str, Any]], browser=None) -> bool:
+        """Check notebooks concurrently, at most max_parallel loading at a time.
+
+        One Chrome process serves every check; each notebook gets its own
+        throwaway context seeded from the profile's state.json, parsed once.
+
+        Args:
+            notebooks: Notebooks to check, by id
+            browser: Shared browser to reuse (left open); None launches one
+
+        Returns:
+            False if the session turned out not to be logged in
+        """
+        if browser is not None:
+            return await self._validate_with_browser(browser, notebooks)
+
+        async with async_playwright() as p:
+            browser = await BrowserFactory.launch_browser_async(p, headless=True)
+            try:
+                return await self._validate_with_browser(browser, notebooks)
+            finally:
+                await browser.close()
+
+    async def _validate_with_browser(self, browser, notebooks: Dict[str, Dict[str, Any]]) -> bool:
+        """Verify the session, then run every check on the given browser."""
+        storage_state = self.auth.get_storage_state_dict()
+
+        context = await self._new_context(browser, storage_state)
+        try:
+            page = await context.new_page()
+
             # Check if logged in by visiting home
             print("Verifying session...")
             expect("NotebookLM home should open without redirecting to Google login")
-            page.goto("https://notebooklm.google.com/")
-            time.sleep(3)
-            
-            if "Sign in" in page.title() or "accounts.google.com" in page.url:
+            await page.goto(NOTEBOOKLM_HOME)
+            await page.wait_for_timeout(3000)
+
+            if "Sign in" in await page.title() or "accounts.google.com" in page.url:
                 print("Error: Not logged in. Please run authentication script.")
-                context.close()
-                return
+                return False
+        finally:
+            await context.close()
 
-            try:
-                for notebook_id, notebook in notebooks.items():
-                    self._check_notebook(page, notebook_id, notebook)
-            finally:
-                context.close()
-        
-        self._print_report()
-        self._update_library()
+        # Aliases of one URL share a single check
+        groups: Dict[str, List[str]] = {}
+        for notebook_id, notebook in notebooks.items():
+            key = (notebook.get('url') or '').rstrip('/')
+            groups.setdefault(key or notebook_id, []).append(notebook_id)
+
+        await self._run_pipeline(browser, storage_state, [
+            (ids[0], notebooks[ids[0]]) for ids in groups.values()
+        ])
+
+        for ids in groups.values():
+            for alias_id in ids[1:]:
+                debug(f"Reusing result of {ids[0]} for duplicate URL id={alias_id}")
+                self.results[alias_id] = dict(self.results[ids[0]])
+
+        return True
+
+    async def _run_pipeline(self, browser, storage_state: Optional[Dict[str, Any]], jobs: List[Tuple[str, Dict[str, Any]]]):
+        """Load notebooks and probe loaded pages as two overlapping stages.
+
+        max_parallel loaders open a context, goto and wait for the query
+        input, then hand the page to a bounded queue and move straight on to
+        the next notebook; PROBE_WORKERS probers evaluate and record results.
+        The queue bound keeps at most ~2x max_parallel contexts open.
+        """
+        to_load: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            to_load.put_nowait(job)
+        to_probe: asyncio.Queue = asyncio.Queue(maxsize=self.max_parallel)
+
+        async def loader():
+            while True:
+                try:
+                    notebook_id, notebook = to_load.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                context = await self._new_context(browser, storage_state)
+                try:
+                    page = await context.new_page()
+                    loaded = await self._load_notebook(page, notebook_id, notebook)
+                except BaseException:
+                    await context.close()
+                    raise
+                if loaded is None:
+                    await context.close()
+                else:
+                    await to_probe.put((context, page, notebook_id, loaded))
+
+        async def prober():
+            while True:
+                job = await to_probe.get()
+                if job is None:
+                    return
+                context, page, notebook_id, loaded = job
+                try:
+                    await self._probe_notebook(page, notebook_id, *loaded)
+                finally:
+                    await context.close()
+
+        probers = [asyncio.create_task(prober()) for _ in range(PROBE_WORKERS)]
+        try:
+            await asyncio.gather(*(loader() for _ in range(min(self.max_parallel, len(jobs)))))
+            for _ in probers:
+                await to_probe.put(None)
+            await asyncio.gather(*probers)
+        finally:
+            for task in probers:
+                task.cancel()
+
+    async def _new_context(self, browser, storage_state: Optional[Dict[str, Any]]):
+        """Open a check context that skips images, media, fonts and analytics."""
+        context = await BrowserFactory.new_storage_context_async(browser, storage_state)
+        await context.route("**/*", _block_heavy_requests)
+        return context
+
+    async def _load_notebook(self, page: Page, notebook_id: str, notebook: Dict[str, Any]):
+        """Stage 1: open the notebook and wait for the query input.
 
-    def _check_notebook(self, page: Page, notebook_id: str, notebook: Dict[str, Any]):
-        """Check a single notebook"""
+        Returns:
+            (label, response, is_active) for the probe stage, or None when
+            the result is already recorded (no URL, home redirect, error)
+        """
         url = notebook.get('url')
         name = notebook.get('name', 'Unknown')
         
         if not url:
             print(f"Skipping {name} ({notebook_id}): No URL")
             self.results[notebook_id] = {'status': 'error', 'reason': 'No URL'}
-            return
+            return None
 
-        print(f"Checking: {name} ({url})...", end='', flush=True)
+        # One line per notebook: concurrent checks would garble a split line
+        label = f"Checking: {name} ({url})..."
         debug(f"Validating notebook id={notebook_id}")
         
         try:
-            response = page.goto(url, wait_until="domcontentloaded")
-            
-            # Wait a bit for redirects or JS loading
-            page.wait_for_timeout(5000)
-            
-            # Check for common error indicators
-            current_url = page.url
-            content = page.content()
+            # Return on commit and wait only for the element that proves access
+            response = await page.goto(url, wait_until="commit", timeout=15000)
+
+            # A server-side bounce to home is final: skip the selector wait and DOM probes
+            if _is_home_url(page.url):
+                reason = "Redirected to home (Not Found/No Access)"
+                print(f"{label} [INACTIVE] - {reason}")
+                self.results[notebook_id] = {
+                    'status': 'inactive',
+                    'reason': reason,
+                    'checked_at': datetime.now().isoformat(),
+                    'detected_title': None,
+                }
+                return None
             
+            # Case 1: Success - Input box is present (any selector wins the race)
             is_active = False
-            reason = "Unknown"
-            
-            # Case 1: Success - Input box is present
-            selector, _ = find_first_visible_selector(
-                page,
-                QUERY_INPUT_SELECTORS,
-                context=f"check_notebooks.query_input.{notebook_id}",
-            )
-            if selector:
+            try:
+                await page.wait_for_selector(QUERY_INPUT_SELECTOR, state="visible", timeout=5000)
                 is_active = True
-                reason = "Accessible"
-                debug_kv("check_notebooks.accessible", notebook_id=notebook_id, selector=selector)
+                debug_kv("check_notebooks.accessible", notebook_id=notebook_id, selector=QUERY_INPUT_SELECTOR)
+            except PlaywrightTimeoutError:
+                pass
+        except Exception as e:
+            print(f"{label} [ERROR] - {e}")
+            self.results[notebook_id] = {'status': 'error', 'reason': str(e)}
+            return None
+
+        return label, response, is_active
+
+    async def _probe_notebook(self, page: Page, notebook_id: str, label: str, response, is_active: bool):
+        """Stage 2: classify a loaded page and record the result."""
+        try:
+            reason = "Accessible" if is_active else "Unknown"
+
+            # Check for common error indicators (read after the wait so redirects have landed)
+            current_url = page.url
+
+            probe = await page.evaluate(PAGE_PROBE_JS, ERROR_TEXT_PATTERN)
+            page_title = probe['title']
 
             # Extract real title from page when accessible
             detected_title = None
             if is_active:
-                raw_title = page.title()
+                raw_title = page_title
                 if raw_title and " - NotebookLM" in raw_title:
                     detected_title = raw_title.rsplit(" - NotebookLM", 1)[0].strip()
             
             if not is_active:
                 # Case 2: Redirected to home (common when notebook doesn't exist or no access)
-                if current_url == "https://notebooklm.google.com/":
+                if _is_home_url(current_url):
                     is_active = False
                     reason = "Redirected to home (Not Found/No Access)"
                 # Case 3: Explicit 404 or Error text (needs actual text from UI, guessing common patterns)
-                elif "Notebook not found" in content or "You need access" in content:
+                elif probe['hasError']:
                     is_active = False
                     reason = "Access Denied / Not Found"
                 # Case 4: 404 HTTP status (unlikely with SPA, but possible)
@@ -152,14 +413,14 @@ class NotebookValidator:
                     reason = "HTTP 404"
                 else:
                     # Fallback success check: Look for title or other unique elements
-                    if "NotebookLM" in page.title():
+                    if "NotebookLM" in page_title:
                         # Maybe it loaded but input box isn't visible?
                         # Assume failure if input not found for now to be safe
                         is_active = False
-                        reason = f"Loaded but input missing. Title: {page.title()}"
+                        reason = f"Loaded but input missing. Title: {page_title}"
             
             status = 'active' if is_active else 'inactive'
-            print(f" [{status.upper()}] - {reason}")
+            print(f"{label} [{status.upper()}] - {reason}")
             
             self.results[notebook_id] = {
                 'status': status, 
@@ -169,49 +430,68 @@ class NotebookValidator:
             }
             
         except Exception as e:
-            print(f" [ERROR] - {e}")
+            print(f"{label} [ERROR] - {e}")
             self.results[notebook_id] = {'status': 'error', 'reason': str(e)}
 
     def _print_report(self):
         """Print validation report"""
-        print("\n" + "="*50)
-        print("NOTEBOOK VALIDATION REPORT")
-        print("="*50)
+        # Build the whole report, then write it once instead of a syscall per line
+        out = io.StringIO()
+        print("\n" + "="*50, file=out)
+        print("NOTEBOOK VALIDATION REPORT", file=out)
+        print("="*50, file=out)
         
         active_count = sum(1 for r in self.results.values() if r.get('status') == 'active')
         total_count = len(self.results)
         
-        print(f"Total Notebooks: {total_count}")
-        print(f"Active: {active_count}")
-        print(f"Issues: {total_count - active_count}")
-        print("-" * 50)
+        print(f"Total Notebooks: {total_count}", file=out)
+        print(f"Active: {active_count}", file=out)
+        print(f"Issues: {total_count - active_count}", file=out)
+        print("-" * 50, file=out)
         
+        notebooks = self.library.notebooks
         for notebook_id, result in self.results.items():
             status = result['status']
             if status != 'active':
-                notebook = self.library.notebooks.get(notebook_id, {})
+                notebook = notebooks.get(notebook_id, {})
                 name = notebook.get('name', notebook_id)
-                print(f"[{status.upper()}] {name}: {result['reason']}")
+                print(f"[{status.upper()}] {name}: {result['reason']}", file=out)
+
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
     def _update_library(self):
-        """Update library with validation status and detected titles"""
+        """Store validation status and sync detected titles into the library"""
         print("\nUpdating library metadata...")
+        notebooks = self.library.notebooks
+        now = datetime.now().isoformat()
+        rows = []
+        titles_changed = False
         for notebook_id, result in self.results.items():
-            if notebook_id in self.library.notebooks:
-                self.library.notebooks[notebook_id]['last_check_status'] = result['status']
-                self.library.notebooks[notebook_id]['last_check_reason'] = result['reason']
-                self.library.notebooks[notebook_id]['last_checked'] = datetime.now().isoformat()
-
-                # Sync detected title if available and different
-                detected = result.get('detected_title')
-                if detected and detected != self.library.notebooks[notebook_id].get('name'):
-                    old_name = self.library.notebooks[notebook_id]['name']
-                    self.library.notebooks[notebook_id]['name'] = detected
-                    print(f"  Updated title: '{old_name}' → '{detected}'")
-        
-        self.library._save_library()
-        print("Library updated.")
+            # Cached results keep their original timestamp so the window does not slide
+            if result.get('cached'):
+                continue
+            notebook = notebooks.get(notebook_id)
+            if notebook is None:
+                continue
+            rows.append((notebook_id, result['status'], result['reason'], now))
 
+            # Sync detected title if available and different
+            detected = result.get('detected_title')
+            if detected and detected != notebook.get('name'):
+                old_name = notebook['name']
+                notebook['name'] = detected
+                titles_changed = True
+                print(f"  Updated title: '{old_name}' → '{detected}'")
+
+        # One transaction for all status rows; library.json is rewritten only for titles
+        with ValidationStore(self.store_path) as store:
+            store.upsert_many(rows)
+            # Rows for notebooks since removed from the library would otherwise pile up
+            store.prune(notebooks)
+        if titles_changed:
+            self.library._save_library()
+        print("Library updated.")
 
 if __name__ == "__main__":
     import argparse
@@ -223,7 +503,14 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Validate notebook links')
     parser.epilog = runtime_options_help()
     parser.add_argument('--profile', help='Profile to use (default: active)')
+    parser.add_argument('--max-age-hours', type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help=f'Skip notebooks verified active within this many hours (default: {DEFAULT_MAX_AGE_HOURS}, 0 = never skip)')
+    parser.add_argument('--force', action='store_true', help='Re-check every notebook, ignoring recent results')
     args = parser.parse_args(argv)
 
-    validator = NotebookValidator(profile_id=getattr(args, 'profile', None))
+    validator = NotebookValidator(
+        profile_id=getattr(args, 'profile', None),
+        max_age_hours=args.max_age_hours,
+        force=args.force,
+    )
     validator.validate_all()
@@ -1,15 +1,32 @@
 #!/usr/bin/env python3
 """Cleanup manager for NotebookLM skill data and browser state."""
 
-import shutil
+import io
+import os
+import stat
 import argparse
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
-
+from typing import Dict, List, Any, Optional
+
+from config import (
+    LIBRARY_CACHE_NAME,
+    USE_LOG_NAME,
+    USE_LOG_SAVING_GLOB,
+    VALIDATION_DB_NAME,
+)
 from runtime_logging import configure_runtime, extract_runtime_flags, runtime_options_help, step
 
 
+# Threads used to size or delete cleanup targets concurrently
+SIZE_WORKERS = 8
+
+# Units for _format_size, one per power of 1024
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
 class CleanupManager:
     """
     Manages cleanup of NotebookLM skill data.
@@ -38,6 +55,24 @@ class CleanupManager:
 
         Note: .venv is NEVER deleted - it's part of the skill infrastructure
         """
+        paths = self._walk_and_act(preserve_library, 'size')
+        total_size = sum(item['size'] for items in paths.values() for item in items)
+
+        return {
+            'categories': paths,
+            'total_size': total_size,
+            'total_items': sum(len(items) for items in paths.values())
+        }
+
+    def _walk_and_act(self, preserve_library: bool, action: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Scan cleanable items, then size them ('size') or delete them ('delete').
+
+        Deleting measures each tree in the same walk that removes it, so a
+        real cleanup traverses the filesystem once instead of sizing
+        everything first and walking it again to delete. Deleted entries get
+        the freed bytes as 'size'; failed ones get an 'error'.
+        """
         paths = {
             'browser_state': [],
             'sessions': [],
@@ -46,16 +81,11 @@ class CleanupManager:
             'other': []
         }
 
-        total_size = 0
-
         if self.profile_id:
             # Clean a specific profile
             profiles_dir = self.data_dir / "profiles" / self.profile_id
             if profiles_dir.exists():
                 self._scan_profile_dir(profiles_dir, paths, preserve_library)
-                total_size = sum(
-                    item['size'] for items in paths.values() for item in items
-                )
         elif self.data_dir.exists():
             # Clean all profiles
             profiles_dir = self.data_dir / "profiles"
@@ -68,13 +98,11 @@ class CleanupManager:
             browser_state_dir = self.data_dir / "browser_state"
             if browser_state_dir.exists():
                 for item in browser_state_dir.iterdir():
-                    size = self._get_size(item)
                     paths['browser_state'].append({
                         'path': str(item),
-                        'size': size,
+                        'size': None,
                         'type': 'dir' if item.is_dir() else 'file'
                     })
-                    total_size += size
 
             # Sessions
             sessions_file = self.data_dir / "sessions.json"
@@ -85,7 +113,6 @@ class CleanupManager:
                     'size': size,
                     'type': 'file'
                 })
-                total_size += size
 
             # Library (unless preserved)
             if not preserve_library:
@@ -97,7 +124,6 @@ class CleanupManager:
                         'size': size,
                         'type': 'file'
                     })
-                    total_size += size
 
             # Auth info
             auth_info = self.data_dir / "auth_info.json"
@@ -108,33 +134,29 @@ class CleanupManager:
                     'size': size,
                     'type': 'file'
                 })
-                total_size += size
 
             # Other files in data dir (but NEVER .venv!)
             for item in self.data_dir.iterdir():
                 if item.name not in ['browser_state', 'sessions.json', 'library.json', 'auth_info.json']:
-                    size = self._get_size(item)
                     paths['other'].append({
                         'path': str(item),
-                        'size': size,
+                        'size': None,
                         'type': 'dir' if item.is_dir() else 'file'
                     })
-                    total_size += size
 
-        return {
-            'categories': paths,
-            'total_size': total_size,
-            'total_items': sum(len(items) for items in paths.values())
-        }
+        if action == 'delete':
+            self._delete_entries(paths)
+        else:
+            self._fill_sizes(paths)
+        return paths
 
     def _scan_profile_dir(self, profile_dir, paths, preserve_library):
         """Scan a single profile directory for cleanable items."""
         browser_state_dir = profile_dir / "browser_state"
         if browser_state_dir.exists():
             for item in browser_state_dir.iterdir():
-                size = self._get_size(item)
                 paths['browser_state'].append({
-                    'path': str(item), 'size': size,
+                    'path': str(item), 'size': None,
                     'type': 'dir' if item.is_dir() else 'file'
                 })
 
@@ -144,33 +166,107 @@ class CleanupManager:
             paths['auth'].append({'path': str(auth_info), 'size': size, 'type': 'file'})
 
         if not preserve_library:
-            library_file = profile_dir / "library.json"
-            if library_file.exists():
-                size = library_file.stat().st_size
-                paths['library'].append({'path': str(library_file), 'size': size, 'type': 'file'})
+            library_files = [
+                profile_dir / name
+                for name in ("library.json", LIBRARY_CACHE_NAME, USE_LOG_NAME, VALIDATION_DB_NAME)
+            ]
+            library_files.extend(sorted(profile_dir.glob(USE_LOG_SAVING_GLOB)))
+            for library_file in library_files:
+                if library_file.exists():
+                    size = library_file.stat().st_size
+                    paths['library'].append({'path': str(library_file), 'size': size, 'type': 'file'})
+
+    def _fill_sizes(self, paths: Dict[str, List[Dict[str, Any]]]):
+        """Size every entry still marked size=None, walking trees in parallel.
+
+        Sizing is stat-bound I/O, so threads overlap the syscalls across
+        profiles instead of walking one tree after another.
+        """
+        pending = [item for items in paths.values() for item in items if item['size'] is None]
+        sizes = self._map_parallel(self._get_size, [Path(item['path']) for item in pending])
+        for item, size in zip(pending, sizes):
+            item['size'] = size
+
+    def _delete_entries(self, paths: Dict[str, List[Dict[str, Any]]]):
+        """Delete every entry, recording freed bytes or the error on each item.
+
+        Categories run one after another because 'other' can contain trees
+        from earlier categories; items within a category are disjoint and are
+        deleted in parallel.
+        """
+        for items in paths.values():
+            results = self._map_parallel(self._try_delete, [Path(item['path']) for item in items])
+            for item, (size, error) in zip(items, results):
+                name = Path(item['path']).name
+                if error is not None:
+                    item['error'] = error
+                    print(f"  Failed: {name} ({error})")
+                elif size is not None:
+                    item['size'] = size
+                    item['deleted'] = True
+                    print(f"  Deleted: {name}")
+
+    def _map_parallel(self, func, args: List[Any]) -> List[Any]:
+        """Run func over args on up to SIZE_WORKERS threads, keeping order."""
+        if len(args) <= 1:
+            return [func(arg) for arg in args]
+        with ThreadPoolExecutor(max_workers=min(SIZE_WORKERS, len(args))) as pool:
+            return list(pool.map(func, args))
+
+    def _try_delete(self, path: Path):
+        """Delete path; returns (freed bytes or None if already gone, error)."""
+        try:
+            return self._delete_path(path), None
+        except Exception as e:
+            return None, str(e)
+
+    def _delete_path(self, path: Path) -> Optional[int]:
+        """Delete a file or tree and return the bytes freed."""
+        try:
+            st = path.lstat()
+        except FileNotFoundError:
+            return None
+        if stat.S_ISDIR(st.st_mode):
+            return self._delete_tree(path)
+        path.unlink()
+        return st.st_size if stat.S_ISREG(st.st_mode) else 0
 
     def _get_size(self, path: Path) -> int:
         """Get size of file or directory in bytes"""
-        if path.is_file():
-            return path.stat().st_size
-        elif path.is_dir():
-            total = 0
+        try:
+            st = path.stat()
+        except OSError:
+            return 0
+        if not stat.S_ISDIR(st.st_mode):
+            return st.st_size if stat.S_ISREG(st.st_mode) else 0
+
+        # Explicit scandir stack: DirEntry type checks come from the directory
+        # listing itself, so each file costs one stat instead of rglob's
+        # is_file() + stat() pair and Path allocation.
+        total = 0
+        stack = [str(path)]
+        while stack:
             try:
-                for item in path.rglob('*'):
-                    if item.is_file():
-                        total += item.stat().st_size
-            except Exception:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_file(follow_symlinks=False):
+                                total += entry.stat(follow_symlinks=False).st_size
+                            elif entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                        except OSError:
+                            pass
+            except OSError:
                 pass
-            return total
-        return 0
+        return total
 
     def _format_size(self, size: int) -> str:
         """Format size in human-readable form"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-        return f"{size:.1f} TB"
+        if size <= 0:
+            return "0.0 B"
+        # bit_length picks the 1024-power directly instead of dividing in a loop
+        idx = min((int(size).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{size / (1 << (idx * 10)):.1f} {SIZE_UNITS[idx]}"
 
     def perform_cleanup(
         self,
@@ -187,37 +283,29 @@ class CleanupManager:
         Returns:
             Dict with cleanup results
         """
-        cleanup_data = self.get_cleanup_paths(preserve_library)
-        deleted_items = []
-        failed_items = []
-        deleted_size = 0
-
         if dry_run:
+            cleanup_data = self.get_cleanup_paths(preserve_library)
             return {
                 'dry_run': True,
                 'would_delete': cleanup_data['total_items'],
                 'would_free': cleanup_data['total_size']
             }
 
-        # Perform deletion
-        for category, items in cleanup_data['categories'].items():
+        # Perform deletion (sizes are measured while deleting)
+        paths = self._walk_and_act(preserve_library, 'delete')
+        deleted_items = []
+        failed_items = []
+        deleted_size = 0
+        for items in paths.values():
             for item_info in items:
-                path = Path(item_info['path'])
-                try:
-                    if path.exists():
-                        if path.is_dir():
-                            shutil.rmtree(path)
-                        else:
-                            path.unlink()
-                        deleted_items.append(str(path))
-                        deleted_size += item_info['size']
-                        print(f"  Deleted: {path.name}")
-                except Exception as e:
+                if 'error' in item_info:
                     failed_items.append({
-                        'path': str(path),
-                        'error': str(e)
+                        'path': item_info['path'],
+                        'error': item_info['error']
                     })
-                    print(f"  Failed: {path.name} ({e})")
+                elif item_info.get('deleted'):
+                    deleted_items.append(item_info['path'])
+                    deleted_size += item_info['size']
 
         # Recreate profile dirs if everything was deleted
         if not preserve_library and not failed_items and not self.profile_id:
@@ -232,37 +320,81 @@ class CleanupManager:
             'failed_count': len(failed_items)
         }
 
+    def _delete_tree(self, path: Path) -> int:
+        """
+        Delete a directory tree, summing file sizes during the same walk.
+
+        The tree is renamed aside first so data/ never shows a half-deleted
+        profile; a delete interrupted midway leaves <name>.trash-* which the
+        next cleanup picks up under 'other'. If the rename fails (e.g. files
+        locked on Windows), the tree is removed in place.
+        """
+        trash = path.with_name(f"{path.name}.trash-{os.getpid()}-{time.time_ns()}")
+        try:
+            os.rename(path, trash)
+        except OSError:
+            trash = path
+
+        total = 0
+        dirs = []
+        stack = [str(trash)]
+        while stack:
+            current = stack.pop()
+            dirs.append(current)
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                    os.unlink(entry.path)
+        # Parents precede their children in dirs, so reverse order empties each first
+        for current in reversed(dirs):
+            os.rmdir(current)
+        return total
+
     def print_cleanup_preview(self, preserve_library: bool = False):
         """Print a preview of what will be cleaned"""
         data = self.get_cleanup_paths(preserve_library)
 
-        print("\nCleanup Preview")
-        print("=" * 60)
+        # Build the whole preview, then write it once instead of a syscall per line
+        out = io.StringIO()
+
+        print("\nCleanup Preview", file=out)
+        print("=" * 60, file=out)
 
         for category, items in data['categories'].items():
             if items:
-                print(f"\n{category.replace('_', ' ').title()}:")
+                print(f"\n{category.replace('_', ' ').title()}:", file=out)
                 for item in items:
                     path = Path(item['path'])
                     size_str = self._format_size(item['size'])
                     type_icon = "dir" if item['type'] == 'dir' else "file"
-                    print(f"  [{type_icon}] {path.name:<30} {size_str:>10}")
+                    print(f"  [{type_icon}] {path.name:<30} {size_str:>10}", file=out)
 
-        print("\n" + "=" * 60)
-        print(f"Total items: {data['total_items']}")
-        print(f"Total size: {self._format_size(data['total_size'])}")
+        print("\n" + "=" * 60, file=out)
+        print(f"Total items: {data['total_items']}", file=out)
+        print(f"Total size: {self._format_size(data['total_size'])}", file=out)
 
         if preserve_library:
-            print("\nLibrary will be preserved")
+            print("\nLibrary will be preserved", file=out)
 
-        print("\nThis preview shows what would be deleted.")
-        print("Use --confirm to actually perform the cleanup.")
+        print("\nThis preview shows what would be deleted.", file=out)
+        print("Use --confirm to actually perform the cleanup.", file=out)
 
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
-def main():
-    """Command-line interface for cleanup management"""
-    runtime_opts, argv = extract_runtime_flags(sys.argv[1:])
-    configure_runtime("cleanup_manager", **runtime_opts)
+
+_PARSER = None
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; importing the module never pays for it."""
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
 
     parser = argparse.ArgumentParser(
         description='Clean up NotebookLM skill data',
@@ -307,6 +439,16 @@ Examples:
         help='Skip confirmation prompt'
     )
 
+    _PARSER = parser
+    return parser
+
+
+def main():
+    """Command-line interface for cleanup management"""
+    runtime_opts, argv = extract_runtime_flags(sys.argv[1:])
+    configure_runtime("cleanup_manager", **runtime_opts)
+
+    parser = _parser()
     args = parser.parse_args(argv)
 
     # Initialize manager
@@ -320,6 +462,10 @@ Examples:
 
             print("\nWARNING: This will delete the files shown above!")
             print("   Note: .venv is preserved (part of skill infrastructure)")
+            if not sys.stdin.isatty():
+                # Nobody can answer the prompt (CI, pipes): refuse rather than block
+                print("No interactive terminal; re-run with --force to skip confirmation.")
+                return
             response = input("Are you sure? (yes/no): ")
 
             if response.lower() != 'yes':
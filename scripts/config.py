@@ -3,6 +3,7 @@ Configuration for NotebookLM Skill
 Centralizes constants, selectors, and paths
 """
 
+import re
 from pathlib import Path
 
 # Paths
@@ -17,6 +18,19 @@ STATE_FILE = BROWSER_STATE_DIR / "state.json"
 AUTH_INFO_FILE = DATA_DIR / "auth_info.json"
 LIBRARY_FILE = DATA_DIR / "library.json"
 
+# Per-profile data files kept next to library.json
+# Parsed library.json from the last load/save, keyed by the file's (mtime_ns, size)
+LIBRARY_CACHE_NAME = "library.cache.marshal"
+# Notebook uses appended between library.json rewrites, and the files a save
+# renames the log to until library.json carries its uses
+USE_LOG_NAME = "use_log.ndjson"
+USE_LOG_SAVING_GLOB = "use_log.*.saving"
+# Link-check results (see validation_store)
+VALIDATION_DB_NAME = "validation_state.sqlite"
+
+# NotebookLM URL matcher (anchored so it never matches a query parameter)
+NOTEBOOKLM_URL_RE = re.compile(r"^https://notebooklm\.google\.com/")
+
 # NotebookLM Selectors
 QUERY_INPUT_SELECTORS = [
     "textarea.query-box-input",  # Primary
@@ -24,6 +38,9 @@ QUERY_INPUT_SELECTORS = [
     'textarea[aria-label="Input for queries"]',  # Fallback English
 ]
 
+# Add-source dialog; scopes the URL input so the chat query box never matches
+ADD_SOURCE_DIALOG_SELECTOR = '[role="dialog"]'
+
 RESPONSE_SELECTORS = [
     ".to-user-container .message-text-content",  # Primary
     "[data-message-author='bot']",
@@ -52,6 +69,13 @@ BROWSER_ARGS = [
     '--no-default-browser-check'
 ]
 
+# Extra flags for headless flows that only click and fill (no rendered media needed)
+LIGHTWEIGHT_BROWSER_ARGS = [
+    '--blink-settings=imagesEnabled=false',
+    '--disable-features=Translate,MediaRouter,RendererCodeIntegrity',
+    '--disable-background-networking',
+]
+
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
 # Timeouts
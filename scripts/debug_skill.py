@@ -1,22 +1,33 @@
 #!/usr/bin/env python3
 """
 Smoke Test Runner for NotebookLM Skill
-Tests each functional layer in sequence.
+Tests each functional layer, reporting in layer order.
 Each failed layer prints a direct fix hint inline — no need to dig through logs.
 
 Usage:
     .\\run.bat debug_skill.py
     .\\run.bat debug_skill.py --no-browser   # Skip browser launch (faster)
     .\\run.bat debug_skill.py --check-links  # Also validate all notebook URLs
+    .\\run.bat debug_skill.py --no-cache     # Re-check patchright import
+    .\\run.bat debug_skill.py --fail-fast    # Stop at the first broken layer (CI)
+    .\\run.bat debug_skill.py --full         # Include advisory checks (requirements.txt)
+    .\\run.bat debug_skill.py --json         # Machine-readable results for CI
 """
 
+import os
 import sys
+import threading
 import time
 import argparse
+import contextlib
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent))
+from config import DATA_DIR, SKILL_DIR
 from runtime_logging import configure_runtime, extract_runtime_flags, runtime_options_help, step
 
 # ANSI colors — supported on Windows Terminal, VS Code, and most CI systems
@@ -32,6 +43,34 @@ STATUS_WARN = f"{_YELLOW}[WARN]{_RESET}"
 STATUS_FAIL = f"{_RED}[FAIL]{_RESET}"
 STATUS_SKIP = f"{_CYAN}[SKIP]{_RESET}"
 
+_BADGES = {
+    "pass": STATUS_PASS,
+    "warn": STATUS_WARN,
+    "fail": STATUS_FAIL,
+    "skip": STATUS_SKIP,
+}
+
+# With --fail-fast, a FAIL in a key layer skips the layers it lists
+FAIL_FAST_BLOCKS = {
+    "env": ("auth", "library", "browser", "links"),
+    "auth": ("browser", "links"),
+}
+
+# Notebook pages the link layer loads at once
+LINK_CHECK_PARALLEL = 8
+
+# A passing patchright import is remembered for this long (per interpreter)
+PATCHRIGHT_CACHE = DATA_DIR / "cache" / "patchright-ok"
+PATCHRIGHT_CACHE_TTL = 3600
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    """One stat per path: None for a missing file, so existence and mtime share the call."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
 
 class SmokeTestResult:
     """Holds the outcome of a single smoke test check"""
@@ -44,31 +83,85 @@ class SmokeTestResult:
         self.hint = hint
 
     def badge(self) -> str:
-        return {
-            "pass": STATUS_PASS,
-            "warn": STATUS_WARN,
-            "fail": STATUS_FAIL,
-            "skip": STATUS_SKIP,
-        }.get(self.status, STATUS_SKIP)
+        return _BADGES.get(self.status, STATUS_SKIP)
 
 
 class SmokeTester:
     """
-    Runs smoke tests across 5 layers in dependency order.
+    Runs smoke tests across 5 layers; Layers 1-4 run concurrently.
     A critical FAIL in Layer 4 (browser) blocks Layer 5 (links) automatically.
+    With fail_fast, layers run in order and env/auth FAILs skip what depends on them.
     """
 
-    def __init__(self, run_browser: bool = True, check_links: bool = False):
+    def __init__(
+        self,
+        run_browser: bool = True,
+        check_links: bool = False,
+        use_cache: bool = True,
+        fail_fast: bool = False,
+        full: bool = False,
+        json_output: bool = False,
+    ):
         self.run_browser = run_browser
         self.check_links = check_links
+        self.use_cache = use_cache
+        self.fail_fast = fail_fast
+        self.full = full
+        self.json_output = json_output
         self.results: List[SmokeTestResult] = []
-        self._browser_failed = False
+        # Status tallies, filled in by the summary
+        self.counts: Counter = Counter()
+        # Layer -> the layer whose failure blocks it
+        self._blocked: Dict[str, str] = {}
+        # Profile registry, built on the main thread before checks fan out
+        self._profiles = None
+        # One library.json load shared by every check (they run on worker threads)
+        self._library = None
+        self._library_lock = threading.Lock()
+        # Browser launched by Layer 4 and reused by Layer 5. Async objects are
+        # bound to the loop that created them, so both layers drive this one
+        # loop from the main thread (never at the same time).
+        self._loop = None
+        self._playwright = None
+        self._browser = None
+
+    def _get_profiles(self):
+        """The process-wide ProfileManager (running the legacy-layout migration on first use)."""
+        if self._profiles is None:
+            from profile_manager import get_profile_manager
+            self._profiles = get_profile_manager()
+        return self._profiles
+
+    def _get_library(self):
+        """Load the notebook library once, read-only; a load error is re-raised to every caller."""
+        with self._library_lock:
+            if self._library is None:
+                try:
+                    from notebook_manager import NotebookLibrary
+                    self._library = NotebookLibrary(read_only=True)
+                except Exception as e:
+                    self._library = e
+        if isinstance(self._library, Exception):
+            raise self._library
+        return self._library
 
     # ── Layer 1: Environment ──────────────────────────────────────────────
 
+    def _check_environment(self) -> SmokeTestResult:
+        """venv + patchright in one row: passes only when .venv exists and the import works."""
+        venv = self._check_venv()
+        if venv.status == "fail":
+            return venv
+        result = self._check_patchright()
+        if result.status == "pass":
+            return SmokeTestResult(
+                "env", "Virtual environment + patchright", "pass", result.detail or venv.detail
+            )
+        return result
+
     def _check_venv(self) -> SmokeTestResult:
-        venv_dir = Path(__file__).parent.parent / ".venv"
-        if venv_dir.exists():
+        venv_dir = SKILL_DIR / ".venv"
+        if _stat(venv_dir) is not None:
             return SmokeTestResult("env", "Virtual environment (.venv)", "pass", str(venv_dir))
         return SmokeTestResult(
             "env", "Virtual environment (.venv)", "fail",
@@ -77,19 +170,37 @@ class SmokeTester:
         )
 
     def _check_patchright(self) -> SmokeTestResult:
+        # Importing Playwright's module graph is slow; a recent pass from this
+        # same interpreter is good enough for a smoke test
+        if self.use_cache and self._patchright_cached():
+            return SmokeTestResult("env", "patchright importable", "pass", "(cached)")
         try:
             import patchright  # noqa: F401
             from patchright.sync_api import sync_playwright  # noqa: F401
-            return SmokeTestResult("env", "patchright importable", "pass", "")
         except ImportError as e:
+            PATCHRIGHT_CACHE.unlink(missing_ok=True)
             return SmokeTestResult(
                 "env", "patchright importable", "fail", str(e),
                 hint="Run:  python install.py"
             )
+        try:
+            PATCHRIGHT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            PATCHRIGHT_CACHE.write_text(sys.executable, encoding="utf-8")
+        except OSError:
+            pass
+        return SmokeTestResult("env", "patchright importable", "pass", "")
+
+    def _patchright_cached(self) -> bool:
+        try:
+            if time.time() - PATCHRIGHT_CACHE.stat().st_mtime >= PATCHRIGHT_CACHE_TTL:
+                return False
+            return PATCHRIGHT_CACHE.read_text(encoding="utf-8") == sys.executable
+        except OSError:
+            return False
 
     def _check_requirements_file(self) -> SmokeTestResult:
-        req = Path(__file__).parent.parent / "requirements.txt"
-        if req.exists():
+        req = SKILL_DIR / "requirements.txt"
+        if _stat(req) is not None:
             return SmokeTestResult("env", "requirements.txt present", "pass", str(req))
         return SmokeTestResult(
             "env", "requirements.txt present", "warn",
@@ -101,17 +212,21 @@ class SmokeTester:
 
     def _check_auth_state(self) -> SmokeTestResult:
         try:
-            from auth_manager import AuthManager
-            mgr = AuthManager()
-
-            if not mgr.state_file or not mgr.state_file.exists():
+            # Only the file's mtime matters here: resolve the path from the
+            # profile registry and stat it once, without building an AuthManager
+            pm = self._get_profiles()
+            state_stat = None
+            if pm.active_profile:
+                state_stat = _stat(pm.get_paths(pm.active_profile)["state_file"])
+
+            if state_stat is None:
                 return SmokeTestResult(
                     "auth", "Auth state file (state.json)", "fail",
                     "state.json not found — never authenticated",
                     hint="Run:  .\\run.bat auth_manager.py setup  (browser opens for Google login)"
                 )
 
-            age_days = (time.time() - mgr.state_file.stat().st_mtime) / 86400
+            age_days = (time.time() - state_stat.st_mtime) / 86400
             if age_days > 7:
                 return SmokeTestResult(
                     "auth", "Auth state freshness", "warn",
@@ -133,8 +248,7 @@ class SmokeTester:
 
     def _check_library(self) -> SmokeTestResult:
         try:
-            from notebook_manager import NotebookLibrary
-            lib = NotebookLibrary()
+            lib = self._get_library()
             count = len(lib.notebooks)
 
             if count == 0:
@@ -160,8 +274,7 @@ class SmokeTester:
 
     def _check_active_notebook(self) -> SmokeTestResult:
         try:
-            from notebook_manager import NotebookLibrary
-            lib = NotebookLibrary()
+            lib = self._get_library()
 
             if not lib.active_notebook_id:
                 return SmokeTestResult(
@@ -193,17 +306,32 @@ class SmokeTester:
                 "browser", "Browser launch", "skip",
                 "Skipped via --no-browser"
             )
+
+        # Without --check-links nothing else needs Chrome: try a plain HTTP
+        # request with the saved cookies first and launch only if inconclusive
+        if not self.check_links:
+            outcome, url_after = self._probe_home_http()
+            if outcome == "login":
+                return SmokeTestResult(
+                    "browser", "NotebookLM home reachable", "fail",
+                    f"Redirected to Google login (session expired). URL: {url_after}",
+                    hint="Run:  .\\run.bat auth_manager.py reauth"
+                )
+            if outcome == "ok":
+                return SmokeTestResult(
+                    "browser", "NotebookLM home reachable (HTTP)", "pass",
+                    "Saved session accepted — Chrome not launched"
+                )
+
         try:
-            from patchright.sync_api import sync_playwright
-            from browser_utils import BrowserFactory
+            # asyncio is most of this module's import cost; only the browser layers use it
+            import asyncio
 
-            with sync_playwright() as p:
-                context = BrowserFactory.launch_persistent_context(p, headless=True)
-                page = context.new_page()
-                page.goto("https://notebooklm.google.com/", wait_until="domcontentloaded")
-                title = page.title()
-                url_after = page.url
-                context.close()
+            self._loop = asyncio.new_event_loop()
+            title, url_after = self._loop.run_until_complete(self._open_notebooklm_home())
+            # Only the link layer needs the browser afterwards
+            if not self.check_links:
+                self._close_browser()
 
             if "accounts.google.com" in url_after:
                 return SmokeTestResult(
@@ -217,12 +345,102 @@ class SmokeTester:
                 f"Title: {title!r}"
             )
         except Exception as e:
-            self._browser_failed = True
+            self._blocked.setdefault("links", "browser")
             return SmokeTestResult(
                 "browser", "Browser launch", "fail", str(e),
                 hint="Chrome may not be installed. Run:  python install.py"
             )
 
+    def _probe_home_http(self) -> Tuple[Optional[str], str]:
+        """
+        Request NotebookLM home with state.json cookies, not following redirects.
+
+        Returns:
+            ("ok" | "login" | None, url). "ok" means home answered 200,
+            "login" a redirect to accounts.google.com; None (no cookies,
+            network error, any other answer) means ask the browser instead.
+        """
+        from urllib.parse import urlsplit
+        from urllib.request import HTTPRedirectHandler, Request, build_opener
+        from urllib.error import HTTPError, URLError
+
+        from auth_manager import AuthManager
+        from config import USER_AGENT
+
+        home = "https://notebooklm.google.com/"
+        state = AuthManager().get_storage_state_dict()
+        if not state:
+            return None, home
+
+        host = urlsplit(home).hostname
+        now = time.time()
+        cookie_header = "; ".join(
+            f"{c['name']}={c['value']}"
+            for c in state.get("cookies", [])
+            if (host == c.get("domain", "").lstrip(".") or host.endswith("." + c.get("domain", "").lstrip(".")))
+            and (c.get("expires", -1) in (-1, None) or c["expires"] > now)
+        )
+        if not cookie_header:
+            return None, home
+
+        class _NoRedirect(HTTPRedirectHandler):
+            def redirect_request(self, *args, **kwargs):
+                return None
+
+        request = Request(home, headers={"Cookie": cookie_header, "User-Agent": USER_AGENT})
+        try:
+            with build_opener(_NoRedirect).open(request, timeout=5) as response:
+                return ("ok" if response.status == 200 else None), home
+        except HTTPError as e:
+            location = e.headers.get("Location", "")
+            if 300 <= e.code < 400 and "accounts.google.com" in location:
+                return "login", location
+            return None, home
+        except (URLError, OSError):
+            return None, home
+
+    async def _open_notebooklm_home(self):
+        """Launch the shared browser and load NotebookLM home with the saved session."""
+        from patchright.async_api import async_playwright
+        from auth_manager import AuthManager
+        from browser_utils import BrowserFactory
+
+        self._playwright = await async_playwright().start()
+        self._browser = await BrowserFactory.launch_browser_async(self._playwright, headless=True)
+        context = await BrowserFactory.new_storage_context_async(
+            self._browser, AuthManager().get_storage_state_dict()
+        )
+        try:
+            page = await context.new_page()
+            # The login redirect is decided by the HTTP response; don't wait for the SPA
+            await page.goto("https://notebooklm.google.com/", wait_until="commit")
+            url_after = page.url
+            try:
+                title = await page.title()
+            except Exception:
+                # The document may still be swapping in right after commit; title is display-only
+                title = ""
+            return title, url_after
+        finally:
+            await context.close()
+
+    def _close_browser(self):
+        """Close the shared browser, Playwright and their loop (idempotent)."""
+        if self._loop is None:
+            return
+        loop, self._loop = self._loop, None
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        try:
+            if browser is not None:
+                loop.run_until_complete(browser.close())
+            if playwright is not None:
+                loop.run_until_complete(playwright.stop())
+        except Exception:
+            pass
+        finally:
+            loop.close()
+
     # ── Layer 5: Notebook Links ───────────────────────────────────────────
 
     def _check_notebook_links(self) -> List[SmokeTestResult]:
@@ -232,25 +450,29 @@ class SmokeTester:
                 "Pass --check-links to enable this layer"
             )]
 
-        if self._browser_failed:
+        if "links" in self._blocked:
             return [SmokeTestResult(
                 "links", "Notebook link validation", "skip",
-                "Skipped — browser layer failed"
+                f"Skipped — {self._blocked['links']} layer failed"
             )]
 
         try:
             from check_notebooks import NotebookValidator
-            from notebook_manager import NotebookLibrary
 
-            lib = NotebookLibrary()
+            lib = self._get_library()
             if not lib.notebooks:
                 return [SmokeTestResult(
                     "links", "Notebook links", "skip",
                     "No notebooks in library"
                 )]
 
-            validator = NotebookValidator()
-            validator.validate_all()
+            # validate_all already fans checks out over one browser; widen it for the smoke run
+            validator = NotebookValidator(max_parallel=min(LINK_CHECK_PARALLEL, len(lib.notebooks)))
+            if self._browser is not None:
+                # Reuse Layer 4's Chrome instead of launching a second one
+                self._loop.run_until_complete(validator.validate_all_async(browser=self._browser))
+            else:
+                validator.validate_all()
 
             results = []
             for nb_id, result in validator.results.items():
@@ -277,78 +499,141 @@ class SmokeTester:
 
     def run(self):
         step("Run smoke test layers")
-        print(f"\n{_BOLD}{'=' * 56}")
-        print("  NotebookLM Skill — Smoke Test Runner")
-        print(f"{'=' * 56}{_RESET}\n")
+        if not self.json_output:
+            self._run_layers()
+            return
+
+        # stdout carries only the JSON document; anything the checks print
+        # themselves (library loads, validator progress) goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            self._run_layers()
+        sys.stdout.write(json.dumps([vars(r) for r in self.results], indent=2) + "\n")
+        sys.stdout.flush()
+
+    def _run_layers(self):
+        self._write(
+            f"\n{_BOLD}{'=' * 56}\n"
+            "  NotebookLM Skill — Smoke Test Runner\n"
+            f"{'=' * 56}{_RESET}\n\n"
+        )
 
         layer_groups = [
-            ("Layer 1: Environment", [
-                self._check_venv,
-                self._check_patchright,
-                self._check_requirements_file,
-            ]),
-            ("Layer 2: Auth", [
+            ("Layer 1: Environment", "env", [self._check_environment] + (
+                [self._check_requirements_file] if self.full else []
+            )),
+            ("Layer 2: Auth", "auth", [
                 self._check_auth_state,
             ]),
-            ("Layer 3: Library", [
+            ("Layer 3: Library", "library", [
                 self._check_library,
                 self._check_active_notebook,
             ]),
-            ("Layer 4: Browser", [
+            ("Layer 4: Browser", "browser", [
                 self._check_browser_launch,
             ]),
         ]
 
-        for layer_name, checks in layer_groups:
-            print(f"{_BOLD}{_CYAN}{layer_name}{_RESET}")
-            for fn in checks:
-                result = fn()
-                self.results.append(result)
-                self._print_result(result)
-            print()
+        collect = self._collect_in_order if self.fail_fast else self._collect_concurrently
+        for layer_name, results in collect(layer_groups):
+            # One write per layer; results arrive together anyway
+            self.results.extend(results)
+            self._write(
+                f"{_BOLD}{_CYAN}{layer_name}{_RESET}\n"
+                + "".join(self._format_result(r) for r in results)
+                + "\n"
+            )
 
-        print(f"{_BOLD}{_CYAN}Layer 5: Notebook Links{_RESET}")
-        for result in self._check_notebook_links():
-            self.results.append(result)
-            self._print_result(result)
-        print()
+        # Header goes out first: the validator prints progress while it runs
+        self._write(f"{_BOLD}{_CYAN}Layer 5: Notebook Links{_RESET}\n")
+        try:
+            link_results = self._check_notebook_links()
+        finally:
+            self._close_browser()
+        self.results.extend(link_results)
+        self._write("".join(self._format_result(r) for r in link_results) + "\n")
 
+        self.counts = Counter(r.status for r in self.results)
         self._print_summary()
 
-    def _print_result(self, r: SmokeTestResult):
+    def _collect_concurrently(self, layer_groups):
+        """Yield (layer name, results) in layer order, running every check at once."""
+        # Layers 1-3 run on worker threads while the browser check runs here:
+        # its event loop owns the Chrome subprocess, and Layer 5 and
+        # _close_browser drive that same loop from this thread later
+        checks = [fn for _, _, fns in layer_groups for fn in fns if fn != self._check_browser_launch]
+        # The auth, library and browser checks all resolve profiles; set the
+        # registry up once here so they never race the legacy migration
+        try:
+            self._get_profiles()
+        except Exception:
+            pass  # each check reports the failure itself
+        with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+            futures = {fn: pool.submit(fn) for fn in checks}
+            browser_result = self._check_browser_launch()
+            for layer_name, _, fns in layer_groups:
+                yield layer_name, [
+                    browser_result if fn == self._check_browser_launch else futures[fn].result()
+                    for fn in fns
+                ]
+
+    def _collect_in_order(self, layer_groups):
+        """Yield (layer name, results) running layers one by one, skipping blocked ones."""
+        for layer_name, layer, fns in layer_groups:
+            blocker = self._blocked.get(layer)
+            if blocker:
+                yield layer_name, [SmokeTestResult(
+                    layer, f"{layer_name} checks", "skip",
+                    f"Skipped — {blocker} layer failed (--fail-fast)"
+                )]
+                continue
+            results = [fn() for fn in fns]
+            if any(r.status == "fail" for r in results):
+                for blocked in FAIL_FAST_BLOCKS.get(layer, ()):
+                    self._blocked.setdefault(blocked, layer)
+            yield layer_name, results
+
+    def _write(self, text: str):
+        """Emit a block of output with a single write (nothing in JSON mode)."""
+        if self.json_output:
+            return
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def _format_result(self, r: SmokeTestResult) -> str:
         detail_str = f"  {_CYAN}{r.detail}{_RESET}" if r.detail else ""
-        print(f"  {r.badge()}  {r.name}{detail_str}")
-        if r.hint and r.status in ("fail", "warn"):
-            for line in r.hint.split("\n"):
-                print(f"         {_YELLOW}→ {line}{_RESET}")
+        head = f"  {r.badge()}  {r.name}{detail_str}\n"
+        if not r.hint or r.status not in ("fail", "warn"):
+            return head
+        return head + "".join(f"         {_YELLOW}→ {line}{_RESET}\n" for line in r.hint.split("\n"))
 
     def _print_summary(self):
-        passed  = sum(1 for r in self.results if r.status == "pass")
-        warned  = sum(1 for r in self.results if r.status == "warn")
-        failed  = sum(1 for r in self.results if r.status == "fail")
-        skipped = sum(1 for r in self.results if r.status == "skip")
+        passed  = self.counts["pass"]
+        warned  = self.counts["warn"]
+        failed  = self.counts["fail"]
+        skipped = self.counts["skip"]
         total   = len(self.results)
 
-        print(f"{_BOLD}{'=' * 56}")
-        print("  SUMMARY")
-        print(f"{'=' * 56}{_RESET}")
-        print(
+        lines = [
+            f"{_BOLD}{'=' * 56}",
+            "  SUMMARY",
+            f"{'=' * 56}{_RESET}",
             f"  {STATUS_PASS} {passed}  "
             f"{STATUS_WARN} {warned}  "
             f"{STATUS_FAIL} {failed}  "
             f"{STATUS_SKIP} {skipped}  "
-            f"of {total} checks"
-        )
+            f"of {total} checks",
+        ]
 
         if failed > 0:
-            print(f"\n  {_RED}Skill has critical issues — fix FAIL items above.{_RESET}")
-            print(f"  See: references/debugging.md for per-layer recovery steps.")
+            lines.append(f"\n  {_RED}Skill has critical issues — fix FAIL items above.{_RESET}")
+            lines.append("  See: references/debugging.md for per-layer recovery steps.")
         elif warned > 0:
-            print(f"\n  {_YELLOW}Skill is functional but has warnings.{_RESET}")
-            print(f"  See: references/debugging.md for details.")
+            lines.append(f"\n  {_YELLOW}Skill is functional but has warnings.{_RESET}")
+            lines.append("  See: references/debugging.md for details.")
         else:
-            print(f"\n  {_GREEN}All checks passed — skill is fully healthy.{_RESET}")
-        print()
+            lines.append(f"\n  {_GREEN}All checks passed — skill is fully healthy.{_RESET}")
+        lines.append("")
+        self._write("\n".join(lines) + "\n")
 
 
 def main():
@@ -369,16 +654,40 @@ def main():
         action="store_true",
         help="Also validate each notebook URL against NotebookLM (slower)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-import patchright instead of trusting a pass from the last hour"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Also run advisory checks (requirements.txt present)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print results as a JSON list (layer, name, status, detail, hint) instead of the report"
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Run layers in order; an environment or auth FAIL skips the layers that need it"
+    )
     args = parser.parse_args(argv)
 
     tester = SmokeTester(
         run_browser=not args.no_browser,
-        check_links=args.check_links
+        check_links=args.check_links,
+        use_cache=not args.no_cache,
+        fail_fast=args.fail_fast,
+        full=args.full,
+        json_output=args.json
     )
     tester.run()
 
     # Non-zero exit on FAIL — safe to use in CI pipelines
-    sys.exit(1 if any(r.status == "fail" for r in tester.results) else 0)
+    sys.exit(1 if tester.counts["fail"] else 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+"""JSON helpers for NotebookLM skill data files.
+
+Uses orjson (C parser) when it is installed and falls back to stdlib json.
+"""
+
+import dataclasses
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON from bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Path) -> Any:
+    """Read and parse a JSON file in one shot."""
+    return loads(Path(path).read_bytes())
+
+
+def _default(obj: Any) -> Any:
+    """stdlib fallback for the types orjson encodes natively (dataclasses, numpy arrays)."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    tolist = getattr(obj, "tolist", None)
+    if callable(tolist):
+        return tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to JSON bytes, 2-space indented unless indent=False (dataclasses and numpy arrays included)."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def write_json(path: Path, obj: Any, indent: bool = True) -> None:
+    """Serialize and write a JSON file in one shot.
+
+    The bytes go to a sibling temp file that is then os.replace()d over
+    path, so readers never see a half-written file and a crash leaves the
+    previous version intact.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(dumps(obj, indent))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
@@ -1,19 +1,27 @@
 #!/usr/bin/env python3
 """Notebook library management for NotebookLM skill workflows."""
 
-import csv
-import io
+import hashlib
 import json
 import sys
 import argparse
-import uuid
+import atexit
+import functools
+import itertools
+import marshal
 import os
 import re
+import time
 from urllib.parse import unquote
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from bisect import bisect_right
+from collections import Counter
 from datetime import datetime
 
+from config import LIBRARY_CACHE_NAME, USE_LOG_NAME, USE_LOG_SAVING_GLOB
+from json_utils import dumps, loads, read_json, write_json
+from profile_manager import get_profile_manager
 from runtime_logging import (
     configure_runtime,
     debug,
@@ -25,15 +33,141 @@ from runtime_logging import (
     step,
 )
 
+# In-process copy of the marshal cache per library file, so repeated
+# NotebookLibrary() constructions skip the disk read as well. Kept as
+# bytes: each load unmarshals fresh dicts, so instances never share state.
+_LIBRARY_CACHE: Dict[Path, Tuple[Tuple[int, int], bytes]] = {}
 
+# (epoch second, its ISO string) for _now_iso
+_LAST_ISO: Tuple[int, str] = (0, '')
+
+
+def _now_iso() -> str:
+    """Local time as an ISO string at second resolution, formatted once per second"""
+    global _LAST_ISO
+    now = int(time.time())
+    if now != _LAST_ISO[0]:
+        _LAST_ISO = (now, datetime.fromtimestamp(now).isoformat())
+    return _LAST_ISO[1]
+
+
+# Libraries with unsaved changes; flushed at interpreter exit
+_PENDING_LIBRARIES: set = set()
+
+# increment_use_count appends {"id", "ts"} lines to USE_LOG_NAME instead of
+# rewriting library.json, and loads fold the log in memory. A save first renames
+# the log to its own use_log.<pid>.<n>.saving, so later appends start a fresh
+# log, then writes library.json with the names of the files it absorbed under
+# 'use_log_generations' and only then deletes them. A crash before the write
+# leaves the file to be folded again; a crash after it leaves a name the next
+# load skips and the next save deletes, so no use is dropped or counted twice.
+# Makes saving-file names unique across saves within one process
+_SAVE_SEQ = itertools.count()
+# A load that folds at least this many log lines rewrites library.json on flush
+USE_LOG_COMPACT_LINES = 1000
+
+# library.json stays indented for hand-editing up to this many notebooks, compact beyond
+COMPACT_LIBRARY_THRESHOLD = 500
+
+
+def _flush_pending_libraries():
+    for library in list(_PENDING_LIBRARIES):
+        library.flush()
+
+
+atexit.register(_flush_pending_libraries)
+
+NOTEBOOK_ID_RE = re.compile(r'/notebook/([a-f0-9-]+)')
+
+
+@functools.lru_cache(maxsize=None)
+def _ijson():
+    """The optional ijson module, imported on first JSON import rather than at CLI startup"""
+    try:
+        import ijson
+    except ImportError:  # pragma: no cover - optional, only used to stream JSON imports
+        return None
+    return ijson
+
+
+@functools.lru_cache(maxsize=4096)
 def _extract_id_from_url(url: str) -> Optional[str]:
-    """Extract notebook UUID from NotebookLM URL"""
-    match = re.search(r'/notebook/([a-f0-9-]+)', url)
+    """Extract notebook UUID from NotebookLM URL (memoized; imports repeat URLs)"""
+    match = NOTEBOOK_ID_RE.search(url)
     if match:
         return match.group(1)
     return None
 
 
+# Notebook fields stored as lists and written to CSV as ';'-joined strings
+CSV_LIST_FIELDS = ('topics', 'tags', 'content_types', 'use_cases')
+
+# "Select all" checkbox in the source picker; it shares the item selectors
+SOURCE_SELECT_ALL_LABELS = ['Chọn tất cả các nguồn', 'Select all sources']
+
+# Collect the aria-labels of the first item selector that yields any, in one
+# round-trip instead of a get_attribute call per element
+SOURCE_LABELS_JS = """([selectors, exclude]) => {
+    for (const sel of selectors) {
+        const out = [];
+        // Excluded labels seed the seen-set: one O(1) check per element
+        const seen = new Set(exclude);
+        for (const el of document.querySelectorAll(sel)) {
+            const label = el.getAttribute('aria-label');
+            if (label && !seen.has(label)) {
+                seen.add(label);
+                out.push(label);
+            }
+        }
+        if (out.length) return out;
+    }
+    return [];
+}"""
+
+
+# Readiness waits for metadata fetches (ms): event-driven, not fixed sleeps
+QUERY_INPUT_TIMEOUT_MS = 5000
+SOURCE_ITEMS_TIMEOUT_MS = 5000
+# Short pause once the first source item exists so the rest of the list renders
+SOURCE_ITEMS_SETTLE_MS = 100
+
+# First selector whose element is rendered (has layout boxes), or null so that
+# wait_for_function keeps polling; one evaluate replaces an is_visible per selector
+FIRST_VISIBLE_SELECTOR_JS = """selectors => selectors.find(s => {
+    const el = document.querySelector(s);
+    return el !== null && el.getClientRects().length > 0;
+}) || null"""
+
+
+def _first_visible_selector(page, selectors: List[str], timeout: int) -> Optional[str]:
+    """Wait until any of selectors is visible (one in-page poll) and return it, or None"""
+    try:
+        handle = page.wait_for_function(FIRST_VISIBLE_SELECTOR_JS, arg=list(selectors), timeout=timeout)
+        return handle.json_value()
+    except Exception as exc:
+        debug(f"None of {len(selectors)} selectors appeared within {timeout}ms: {exc}")
+        return None
+
+
+def _wait_for_source_items(page, item_selectors: List[str]) -> None:
+    """After expanding the source panel, wait for its first item instead of sleeping"""
+    try:
+        page.wait_for_selector(', '.join(item_selectors), state="attached", timeout=SOURCE_ITEMS_TIMEOUT_MS)
+        page.wait_for_timeout(SOURCE_ITEMS_SETTLE_MS)
+    except Exception as exc:
+        debug(f"No source items appeared after expanding the panel: {exc}")
+
+
+def _notebook_title(raw_title: Optional[str]) -> Optional[str]:
+    """Notebook name from a page title like '<name> - NotebookLM', or None"""
+    if raw_title:
+        if " - NotebookLM" in raw_title:
+            return raw_title.rsplit(" - NotebookLM", 1)[0].strip()
+        if raw_title != "NotebookLM":
+            return raw_title.strip()
+    return None
+
+
 def fetch_notebook_metadata(url: str, profile_id=None, headless: bool = True) -> Dict[str, Any]:
     """
     Navigate to a NotebookLM notebook and extract real metadata.
@@ -41,8 +175,7 @@ def fetch_notebook_metadata(url: str, profile_id=None, headless: bool = True) ->
     Returns:
         Dict with 'title' (str or None) and 'sources' (list of source name strings)
     """
-    from patchright.sync_api import sync_playwright
-    from browser_utils import BrowserFactory, StealthUtils, find_first_visible_selector, log_selector_attempt
+    from browser_utils import BrowserFactory, StealthUtils, any_visible, skip_api_stack_capture
     from auth_manager import AuthManager
     from config import QUERY_INPUT_SELECTORS, SOURCE_PANEL_EXPAND_SELECTORS, SOURCE_PANEL_ITEM_SELECTORS
 
@@ -53,164 +186,210 @@ def fetch_notebook_metadata(url: str, profile_id=None, headless: bool = True) ->
         print("Warning: Not authenticated. Cannot fetch metadata.")
         return {'title': None, 'sources': []}
 
-    playwright = None
-    context = None
-
-    try:
-        playwright = sync_playwright().start()
-        context = BrowserFactory.launch_persistent_context(
-            playwright,
-            headless=headless,
-            user_data_dir=str(auth.browser_profile_dir),
-            state_file=auth.state_file,
-        )
-        page = context.new_page()
-        # Set viewport so full layout renders (sources panel visible)
-        page.set_viewport_size({"width": 1440, "height": 900})
-
-        print("  Fetching notebook metadata...")
-        expect("Notebook page should load and reveal source panel controls")
-        page.goto(url, wait_until="domcontentloaded")
-        page.wait_for_timeout(5000)
-
-        # Check accessibility
-        ready_selector, _ = find_first_visible_selector(
-            page,
-            QUERY_INPUT_SELECTORS,
-            context="metadata.query_input_ready",
-        )
-        is_ready = bool(ready_selector)
-        if ready_selector:
-            debug_kv("metadata.query_input", selector=ready_selector)
-
-        if not is_ready:
-            print("  Warning: Notebook may not be accessible")
-
-        # Extract title from page title
-        raw_title = page.title()
-        title = None
-        if raw_title:
-            if " - NotebookLM" in raw_title:
-                title = raw_title.rsplit(" - NotebookLM", 1)[0].strip()
-            elif raw_title not in ("NotebookLM", ""):
-                title = raw_title.strip()
-
-        # Extract source names from the sources panel
-        sources = []
+    # No user code to debug here, so the per-call stack walk is pure overhead
+    with skip_api_stack_capture():
+        page = None
 
-        # Click "Expand source panel" button to load full source list
-        expand_selector, _ = find_first_visible_selector(
-            page,
-            SOURCE_PANEL_EXPAND_SELECTORS,
-            context="metadata.expand_sources",
-        )
-        if expand_selector:
-            clicked_selector = StealthUtils.realistic_click(
-                page,
-                expand_selector,
-                context="metadata.expand_sources.click",
+        try:
+            # Shared with add-source and other calls in this process; Chrome starts once
+            context = BrowserFactory.get_or_create(
+                headless=headless,
+                user_data_dir=str(auth.browser_profile_dir),
+                state_file=auth.state_file,
             )
-            if not clicked_selector:
-                print(f"  Warning: Could not click expand sources button: {expand_selector}")
+            page = context.new_page()
+            # Set viewport so full layout renders (sources panel visible)
+            page.set_viewport_size({"width": 1440, "height": 900})
+
+            print("  Fetching notebook metadata...")
+            expect("Notebook page should load and reveal source panel controls")
+            page.goto(url, wait_until="domcontentloaded")
+
+            # Check accessibility: wait for any query input instead of a fixed sleep
+            ready_selector = _first_visible_selector(page, QUERY_INPUT_SELECTORS, QUERY_INPUT_TIMEOUT_MS)
+            is_ready = bool(ready_selector)
+            if ready_selector:
+                debug_kv("metadata.query_input", selector=ready_selector)
+
+            if not is_ready:
+                print("  Warning: Notebook may not be accessible")
+
+            # Extract title from page title
+            title = _notebook_title(page.title())
+
+            # Click "Expand source panel" button to load full source list
+            expand_selector = any_visible(SOURCE_PANEL_EXPAND_SELECTORS)
+            debug_kv("selector.scan", context="metadata.expand_sources", action="query_selector",
+                     selector_count=len(SOURCE_PANEL_EXPAND_SELECTORS))
+            if page.query_selector(expand_selector):
+                clicked_selector = StealthUtils.realistic_click(
+                    page,
+                    expand_selector,
+                    context="metadata.expand_sources.click",
+                )
+                if not clicked_selector:
+                    print("  Warning: Could not click expand sources button")
+                else:
+                    print("  Clicked expand sources button")
+                _wait_for_source_items(page, SOURCE_PANEL_ITEM_SELECTORS)
             else:
-                print(f"  Clicked expand btn: {clicked_selector}")
-            page.wait_for_timeout(3000)
-        else:
-            print("  Could not find expand sources button")
-
-        # Extract source names from aria-labels on source checkbox inputs
-        # These are populated after the sources panel is expanded
-        exclude_labels = {'Chọn tất cả các nguồn', 'Select all sources'}
-        debug_kv(
-            "selector.scan",
-            context="metadata.source_items",
-            action="query_selector_all",
-            selector_count=len(SOURCE_PANEL_ITEM_SELECTORS),
-        )
-        for sel in SOURCE_PANEL_ITEM_SELECTORS:
-            log_selector_attempt("metadata.source_items", sel, action="query_selector_all")
+                print("  Could not find expand sources button")
+
+            # Extract source names from aria-labels on source checkbox inputs
+            # These are populated after the sources panel is expanded
             try:
-                elements = page.query_selector_all(sel)
+                sources = page.evaluate(SOURCE_LABELS_JS, [SOURCE_PANEL_ITEM_SELECTORS, SOURCE_SELECT_ALL_LABELS]) or []
             except Exception as exc:
-                log_selector_attempt(
-                    "metadata.source_items",
-                    sel,
-                    action="query_selector_all",
-                    success=False,
-                    reason=str(exc) or type(exc).__name__,
-                )
-                continue
-
-            if not elements:
-                log_selector_attempt(
-                    "metadata.source_items",
-                    sel,
-                    action="query_selector_all",
-                    success=False,
-                    reason="no_elements",
-                )
-                continue
+                debug(f"Source label read failed: {exc}")
+                sources = []
+            debug_kv("metadata.source_items", selector_count=len(SOURCE_PANEL_ITEM_SELECTORS), label_count=len(sources))
+
+            print(f"  Title: {title or '(not found)'}")
+            if sources:
+                print(f"  Sources ({len(sources)}): {', '.join(sources[:5])}")
+            else:
+                print("  Sources: (none extracted)")
+
+            return {'title': title, 'sources': sources}
 
-            added = 0
-            for el in elements:
+        except Exception as e:
+            log_exception("  Error fetching metadata", e)
+            return {'title': None, 'sources': []}
+
+        finally:
+            # The shared context stays open for later operations; only the tab is ours.
+            if page:
                 try:
-                    lbl = el.get_attribute('aria-label')
-                except Exception as exc:
-                    debug(f"Skipping source label read failure for {sel}: {exc}")
-                    continue
-                if lbl and lbl not in exclude_labels and lbl not in sources:
-                    sources.append(lbl)
-                    added += 1
-
-            log_selector_attempt(
-                "metadata.source_items",
-                sel,
-                action="query_selector_all",
-                success=added > 0,
-                reason="labels_extracted" if added > 0 else "labels_filtered_or_empty",
-                element_count=len(elements),
-                added_count=added,
-            )
+                    page.close()
+                except Exception:
+                    pass
 
-            if sources:
-                break
 
-        print(f"  Title: {title or '(not found)'}")
-        if sources:
-            print(f"  Sources ({len(sources)}): {', '.join(sources[:5])}")
-        else:
-            print("  Sources: (none extracted)")
+def fetch_notebook_metadata_bulk(
+    urls: List[str],
+    profile_id=None,
+    headless: bool = True,
+    concurrency: int = 4,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch metadata for several notebooks with one browser.
 
-        return {'title': title, 'sources': sources}
+    Chrome launches once and each URL gets its own lightweight context
+    seeded from the profile's state.json, at most `concurrency` at a time.
 
-    except Exception as e:
-        log_exception("  Error fetching metadata", e)
-        return {'title': None, 'sources': []}
+    Returns:
+        Dict keyed by URL; each value is shaped like fetch_notebook_metadata's result
+    """
+    import asyncio
+    from auth_manager import AuthManager
 
-    finally:
-        if context:
-            try:
-                context.close()
-            except Exception:
-                pass
-        if playwright:
-            try:
-                playwright.stop()
-            except Exception:
-                pass
+    step("Fetch metadata for several notebooks")
+    urls = list(dict.fromkeys(urls))
+    auth = AuthManager(profile_id=profile_id)
+
+    if not auth.is_authenticated():
+        print("Warning: Not authenticated. Cannot fetch metadata.")
+        return {url: {'title': None, 'sources': []} for url in urls}
+    if not urls:
+        return {}
+
+    from browser_utils import skip_api_stack_capture
+
+    # No user code to debug here, so the per-call stack walk is pure overhead
+    with skip_api_stack_capture():
+        return asyncio.run(_fetch_metadata_bulk_async(
+            urls, auth.get_storage_state_dict(), headless, max(1, concurrency)
+        ))
+
+
+async def _fetch_metadata_bulk_async(
+    urls: List[str],
+    storage_state: Optional[Dict[str, Any]],
+    headless: bool,
+    concurrency: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Run _fetch_metadata_async for every URL on one shared Chrome."""
+    import asyncio
+    from patchright.async_api import async_playwright
+    from browser_utils import BrowserFactory
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with async_playwright() as playwright:
+        browser = await BrowserFactory.launch_browser_async(playwright, headless=headless)
+        try:
+            async def fetch_one(url: str) -> Dict[str, Any]:
+                async with semaphore:
+                    context = await BrowserFactory.new_storage_context_async(browser, storage_state)
+                    try:
+                        return await _fetch_metadata_async(context, url)
+                    except Exception as e:
+                        log_exception(f"  Error fetching metadata for {url}", e)
+                        return {'title': None, 'sources': []}
+                    finally:
+                        await context.close()
+
+            results = await asyncio.gather(*(fetch_one(url) for url in urls))
+        finally:
+            await browser.close()
+
+    return dict(zip(urls, results))
+
+
+async def _fetch_metadata_async(context, url: str) -> Dict[str, Any]:
+    """Async twin of fetch_notebook_metadata's page steps for one URL."""
+    from browser_utils import any_visible
+    from config import QUERY_INPUT_SELECTORS, SOURCE_PANEL_EXPAND_SELECTORS, SOURCE_PANEL_ITEM_SELECTORS
+
+    page = await context.new_page()
+    await page.set_viewport_size({"width": 1440, "height": 900})
+    await page.goto(url, wait_until="domcontentloaded")
+
+    try:
+        handle = await page.wait_for_function(
+            FIRST_VISIBLE_SELECTOR_JS, arg=list(QUERY_INPUT_SELECTORS), timeout=QUERY_INPUT_TIMEOUT_MS
+        )
+        is_ready = bool(await handle.json_value())
+    except Exception:
+        is_ready = False
+
+    title = _notebook_title(await page.title())
+
+    expand_selector = any_visible(SOURCE_PANEL_EXPAND_SELECTORS)
+    if await page.query_selector(expand_selector):
+        await page.click(expand_selector)
+        try:
+            await page.wait_for_selector(
+                ', '.join(SOURCE_PANEL_ITEM_SELECTORS), state="attached", timeout=SOURCE_ITEMS_TIMEOUT_MS
+            )
+            await page.wait_for_timeout(SOURCE_ITEMS_SETTLE_MS)
+        except Exception:
+            debug(f"No source items appeared after expanding the panel for {url}")
+
+    try:
+        sources = await page.evaluate(SOURCE_LABELS_JS, [SOURCE_PANEL_ITEM_SELECTORS, SOURCE_SELECT_ALL_LABELS]) or []
+    except Exception as exc:
+        debug(f"Source label read failed for {url}: {exc}")
+        sources = []
+
+    # One line per notebook: concurrent fetches would garble a split report
+    warning = "" if is_ready else " (may not be accessible)"
+    print(f"  {url}: {title or '(title not found)'}, {len(sources)} sources{warning}")
+    return {'title': title, 'sources': sources}
 
 
 class NotebookLibrary:
     """Manages a collection of NotebookLM notebooks with metadata"""
 
-    def __init__(self, profile_id: Optional[str] = None):
+    def __init__(self, profile_id: Optional[str] = None, read_only: bool = False):
         """Initialize the notebook library.
 
         Args:
             profile_id: Profile to load library for. None = active profile.
+            read_only: Never write library.json (for list/search/stats style callers).
         """
-        from profile_manager import ProfileManager
-        pm = ProfileManager()
+        self._read_only = read_only
+        pm = get_profile_manager()
         if profile_id:
             paths = pm.get_paths(profile_id)
         else:
@@ -219,38 +398,235 @@ class NotebookLibrary:
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         self.library_file = paths["library_file"]
+        self.cache_file = self.data_dir / LIBRARY_CACHE_NAME
+        self.use_log_file = self.data_dir / USE_LOG_NAME
+        # Uses per notebook that self.notebooks holds from the logs, not from library.json
+        self._log_uses: Counter = Counter()
+        # (id, ts) of uses whose log append failed; folded in by the next save
+        self._unlogged_uses: List[Tuple[str, str]] = []
         self.notebooks: Dict[str, Dict[str, Any]] = {}
         self.active_notebook_id: Optional[str] = None
+        # Digest of the notebooks/active id last read from or written to disk
+        self._last_saved_hash: Optional[bytes] = None
+        # Search corpus from _search_index, dropped on every change
+        self._search_corpus: Optional[Tuple[str, List[int], List[str]]] = None
+        # (total uses, most used id) for get_stats, dropped on every change
+        self._stats_cache: Optional[Tuple[int, Optional[str]]] = None
+        # Notebooks per topic, built on first get_stats and kept current by the
+        # methods that add, remove or retopic notebooks; None means rebuild
+        self._topic_counts: Optional[Counter] = None
+        # Mutations mark the library dirty; flush() (or exit) writes it once
+        self._dirty = False
+
+        # Another instance's unflushed changes to this file must land before we read it
+        for other in list(_PENDING_LIBRARIES):
+            if other.library_file == self.library_file:
+                other.flush()
 
         # Load existing library
         self._load_library()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def _mark_dirty(self):
+        """Record an in-memory change; written by flush(), on context exit or at exit."""
+        self._search_corpus = None
+        self._stats_cache = None
+        self._dirty = True
+        _PENDING_LIBRARIES.add(self)
+
+    def _retally_topics(self, removed: List[str] = (), added: List[str] = ()):
+        """Apply a topic-list change to _topic_counts, if it has been built."""
+        counts = self._topic_counts
+        if counts is None:
+            return
+        counts.update(added)
+        counts.subtract(removed)
+        for topic in removed:
+            if counts.get(topic, 0) <= 0:
+                counts.pop(topic, None)
+
+    def flush(self):
+        """Write pending changes to library.json, if there are any."""
+        if self._dirty:
+            self._save_library()
+
     def _load_library(self):
         """Load library from disk"""
-        if self.library_file.exists():
+        try:
+            st = self.library_file.stat()
+        except FileNotFoundError:
+            # Read-only probes of a fresh profile should not create the file
+            if not self._read_only:
+                self._save_library()
+            return
+        try:
+            data = self._read_library_data(st)
+            self.notebooks = data.get('notebooks', {})
+            self.active_notebook_id = data.get('active_notebook_id')
+            self._topic_counts = None
+            folded = sum(
+                self._fold_use_log(path)
+                for path in self._pending_use_logs(data) + [self.use_log_file]
+            )
+            # Only a writer compares against the saved hash; read-only loads skip re-serializing
+            if not self._read_only:
+                self._last_saved_hash = self._content_hash()
+                if folded >= USE_LOG_COMPACT_LINES:
+                    # Long log: merge it into library.json on the next flush
+                    self._last_saved_hash = None
+                    self._mark_dirty()
+            print(f"Loaded library with {len(self.notebooks)} notebooks")
+        except Exception as e:
+            print(f"Warning: Error loading library: {e}")
+            self.notebooks = {}
+            self.active_notebook_id = None
+            # An empty in-memory library must never be saved over the unreadable file
+            if not self._read_only:
+                print("Warning: Library opened read-only; changes will not be saved")
+                self._read_only = True
+
+    def _read_library_data(self, st: os.stat_result) -> Dict[str, Any]:
+        """Parse library.json (as stat'ed in st), through the marshal cache when it matches."""
+        key = (st.st_mtime_ns, st.st_size)
+        data = self._read_cache(key)
+        if data is None:
+            data = read_json(self.library_file)
+            self._write_cache(key, data)
+        return data
+
+    def _pending_use_logs(self, data: Dict[str, Any]) -> List[Path]:
+        """Saving files whose uses the library.json parsed into data does not carry yet."""
+        absorbed = set(data.get('use_log_generations', ()))
+        return [path for path in sorted(self.data_dir.glob(USE_LOG_SAVING_GLOB)) if path.name not in absorbed]
+
+    def _fold_use_log(self, path: Path) -> int:
+        """Add one log file's uses to self.notebooks; returns lines folded."""
+        try:
+            lines = path.read_bytes().splitlines()
+        except FileNotFoundError:
+            return 0
+        folded = 0
+        for line in lines:
             try:
-                with open(self.library_file, 'r') as f:
-                    data = json.load(f)
-                    self.notebooks = data.get('notebooks', {})
-                    self.active_notebook_id = data.get('active_notebook_id')
-                    print(f"Loaded library with {len(self.notebooks)} notebooks")
-            except Exception as e:
-                print(f"Warning: Error loading library: {e}")
-                self.notebooks = {}
-                self.active_notebook_id = None
-        else:
-            self._save_library()
+                entry = loads(line)
+                folded += self._apply_use(entry['id'], entry['ts'])
+            except Exception:
+                continue  # a torn trailing write or a bad line
+        return folded
+
+    def _apply_use(self, notebook_id: str, ts: str) -> int:
+        """Count one logged use; returns 0 for a removed notebook or a bad use_count."""
+        try:
+            notebook = self.notebooks[notebook_id]
+            use_count = int(notebook.get('use_count') or 0) + 1
+        except Exception:
+            return 0
+        notebook['use_count'] = use_count
+        notebook['last_used'] = ts
+        self._log_uses[notebook_id] += 1
+        return 1
+
+    def _rebase_use_counts(self, data: Optional[Dict[str, Any]]):
+        """Reset use counts to library.json's (data), dropping every use taken from the logs.
+
+        Notebooks library.json does not have keep their own count minus logged uses.
+        """
+        saved = data.get('notebooks', {}) if data else {}
+        for notebook_id, notebook in self.notebooks.items():
+            base = saved.get(notebook_id)
+            if base is not None:
+                notebook['use_count'] = base.get('use_count', 0)
+                notebook['last_used'] = base.get('last_used')
+            elif self._log_uses[notebook_id]:
+                notebook['use_count'] = int(notebook.get('use_count') or 0) - self._log_uses[notebook_id]
+        self._log_uses = Counter()
+
+    def _read_cache(self, key: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        """Return the cached parse of library.json if it was taken at this (mtime_ns, size)."""
+        memo = _LIBRARY_CACHE.get(self.library_file)
+        try:
+            blob = memo[1] if memo and memo[0] == key else self.cache_file.read_bytes()
+            # marshal only rebuilds plain values (unlike pickle, it never runs code);
+            # a file from another Python version or a torn write just misses
+            cached_key, data = marshal.loads(blob)
+        except Exception:
+            return None
+        if tuple(cached_key) != key or not isinstance(data, dict):
+            return None
+        _LIBRARY_CACHE[self.library_file] = (key, blob)
+        return data
+
+    def _write_cache(self, key: Tuple[int, int], data: Dict[str, Any]):
+        """Best-effort: remember this parse so the next load can skip parsing JSON."""
+        try:
+            blob = marshal.dumps((key, data))
+            _LIBRARY_CACHE[self.library_file] = (key, blob)
+            self.cache_file.write_bytes(blob)
+        except Exception as e:
+            debug(f"Library cache not written: {e}")
+
+    def _content_hash(self) -> bytes:
+        """Digest of the saved state, excluding the file-level updated_at stamp."""
+        blob = dumps([self.notebooks, self.active_notebook_id], indent=False)
+        return hashlib.blake2b(blob, digest_size=16).digest()
 
     def _save_library(self):
-        """Save library to disk"""
+        """Save library to disk (atomically; skipped when nothing changed)"""
+        self._search_corpus = None
+        self._stats_cache = None
+        self._dirty = False
+        _PENDING_LIBRARIES.discard(self)
+        if self._read_only:
+            debug("Read-only library; skipping write")
+            return
         try:
+            content_hash = self._content_hash()
+            if content_hash == self._last_saved_hash:
+                debug("Library unchanged; skipping write")
+                return
+            # Hand the live log over to this save; appends from here on start a new one
+            claimed = self.data_dir / f"use_log.{os.getpid()}.{next(_SAVE_SEQ)}.saving"
+            try:
+                os.replace(self.use_log_file, claimed)
+            except FileNotFoundError:
+                pass
+            # Use counts come from library.json as it is now plus every log it lacks,
+            # so uses folded by other savers since our load are neither lost nor doubled
+            try:
+                saved = self._read_library_data(self.library_file.stat())
+            except FileNotFoundError:
+                saved = None
+            pending = self._pending_use_logs(saved or {})
+            absorbed = [
+                path for path in self.data_dir.glob(USE_LOG_SAVING_GLOB) if path not in pending
+            ]
+            self._rebase_use_counts(saved)
+            for path in pending:
+                self._fold_use_log(path)
+            for notebook_id, ts in self._unlogged_uses:
+                self._apply_use(notebook_id, ts)
+            content_hash = self._content_hash()
             data = {
                 'notebooks': self.notebooks,
                 'active_notebook_id': self.active_notebook_id,
-                'updated_at': datetime.now().isoformat()
+                'updated_at': _now_iso()
             }
-            with open(self.library_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if pending:
+                data['use_log_generations'] = [path.name for path in pending]
+            write_json(self.library_file, data, indent=len(self.notebooks) <= COMPACT_LIBRARY_THRESHOLD)
+            self._last_saved_hash = content_hash
+            self._log_uses = Counter()
+            self._unlogged_uses = []
+            # library.json now carries these uses and names their files
+            for path in pending + absorbed:
+                path.unlink(missing_ok=True)
+            st = self.library_file.stat()
+            self._write_cache((st.st_mtime_ns, st.st_size), data)
         except Exception as e:
             print(f"Error saving library: {e}")
 
@@ -286,7 +662,8 @@ class NotebookLibrary:
         if notebook_id in self.notebooks:
             raise ValueError(f"Notebook with ID '{notebook_id}' already exists")
 
-        # Create notebook object
+        # Create notebook object; created_at and updated_at share one stamp
+        now_iso = _now_iso()
         notebook = {
             'id': notebook_id,
             'url': url,
@@ -296,20 +673,21 @@ class NotebookLibrary:
             'content_types': content_types or [],
             'use_cases': use_cases or [],
             'tags': tags or [],
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
+            'created_at': now_iso,
+            'updated_at': now_iso,
             'use_count': 0,
             'last_used': None
         }
 
         # Add to library
         self.notebooks[notebook_id] = notebook
+        self._retally_topics(added=topics)
 
         # Set as active if it's the first notebook
         if len(self.notebooks) == 1:
             self.active_notebook_id = notebook_id
 
-        self._save_library()
+        self._mark_dirty()
 
         print(f"Added notebook: {name} ({notebook_id})")
         return notebook
@@ -325,16 +703,14 @@ class NotebookLibrary:
             True if removed, False if not found
         """
         if notebook_id in self.notebooks:
-            del self.notebooks[notebook_id]
+            self._retally_topics(removed=self.notebooks.pop(notebook_id).get('topics', ()))
 
             # Clear active if it was removed
             if self.active_notebook_id == notebook_id:
-                self.active_notebook_id = None
-                # Set new active if there are other notebooks
-                if self.notebooks:
-                    self.active_notebook_id = list(self.notebooks.keys())[0]
+                # Set new active if there are other notebooks (first in insertion order)
+                self.active_notebook_id = next(iter(self.notebooks), None)
 
-            self._save_library()
+            self._mark_dirty()
             print(f"Removed notebook: {notebook_id}")
             return True
 
@@ -368,24 +744,28 @@ class NotebookLibrary:
         notebook = self.notebooks[notebook_id]
 
         # Update fields if provided
-        if name is not None:
-            notebook['name'] = name
-        if description is not None:
-            notebook['description'] = description
+        updates = {
+            field: value
+            for field, value in (
+                ('name', name),
+                ('description', description),
+                ('topics', topics),
+                ('content_types', content_types),
+                ('use_cases', use_cases),
+                ('tags', tags),
+                ('url', url),
+            )
+            if value is not None
+        }
+        if not updates:
+            return notebook
+
         if topics is not None:
-            notebook['topics'] = topics
-        if content_types is not None:
-            notebook['content_types'] = content_types
-        if use_cases is not None:
-            notebook['use_cases'] = use_cases
-        if tags is not None:
-            notebook['tags'] = tags
-        if url is not None:
-            notebook['url'] = url
-
-        notebook['updated_at'] = datetime.now().isoformat()
-
-        self._save_library()
+            self._retally_topics(removed=notebook.get('topics', ()), added=topics)
+        notebook.update(updates)
+        notebook['updated_at'] = _now_iso()
+
+        self._mark_dirty()
         print(f"Updated notebook: {notebook['name']}")
         return notebook
 
@@ -408,22 +788,51 @@ class NotebookLibrary:
             List of matching notebooks
         """
         query_lower = query.lower()
-        results = []
+        if not query_lower:
+            return list(self.notebooks.values())
 
-        for notebook in self.notebooks.values():
-            # Search in various fields
-            searchable = [
-                notebook['name'].lower(),
-                notebook['description'].lower(),
-                ' '.join(notebook['topics']).lower(),
-                ' '.join(notebook['tags']).lower(),
-                ' '.join(notebook.get('use_cases', [])).lower()
-            ]
+        corpus, starts, ids = self._search_index()
+        results = []
+        # str.find scans the whole library in C; Python only runs once per hit
+        pos = corpus.find(query_lower)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            end = starts[i + 1] - 1 if i + 1 < len(starts) else len(corpus)
+            if pos + len(query_lower) <= end:
+                results.append(self.notebooks[ids[i]])
+                if i + 1 == len(starts):
+                    break
+                pos = corpus.find(query_lower, starts[i + 1])
+            else:
+                # Match straddles a separator; keep scanning inside the next entry
+                pos = corpus.find(query_lower, pos + 1)
+        return results
 
-            if any(query_lower in field for field in searchable):
-                results.append(notebook)
+    def _search_index(self) -> Tuple[str, List[int], List[str]]:
+        """(corpus, entry start offsets, notebook ids), built once per change.
 
-        return results
+        corpus is every notebook's lowercased name/description/topics/tags/use
+        cases, one entry per notebook joined by NUL. Fields inside an entry are
+        newline-separated so a query cannot match across two of them.
+        """
+        if self._search_corpus is None:
+            texts = [
+                '\n'.join((
+                    notebook['name'],
+                    notebook['description'],
+                    ' '.join(notebook['topics']),
+                    ' '.join(notebook['tags']),
+                    ' '.join(notebook.get('use_cases', [])),
+                )).lower()
+                for notebook in self.notebooks.values()
+            ]
+            starts = []
+            offset = 0
+            for text in texts:
+                starts.append(offset)
+                offset += len(text) + 1
+            self._search_corpus = ('\0'.join(texts), starts, list(self.notebooks))
+        return self._search_corpus
 
     def select_notebook(self, notebook_id: str) -> Dict[str, Any]:
         """
@@ -439,7 +848,7 @@ class NotebookLibrary:
             raise ValueError(f"Notebook not found: {notebook_id}")
 
         self.active_notebook_id = notebook_id
-        self._save_library()
+        self._mark_dirty()
 
         notebook = self.notebooks[notebook_id]
         print(f"Activated notebook: {notebook['name']}")
@@ -493,8 +902,8 @@ class NotebookLibrary:
 
         old_name = notebook.get('name', '')
         notebook['name'] = new_name
-        notebook['updated_at'] = datetime.now().isoformat()
-        self._save_library()
+        notebook['updated_at'] = _now_iso()
+        self._mark_dirty()
         print(f"  Refreshed notebook name: '{old_name}' -> '{new_name}'")
         return True
 
@@ -512,36 +921,52 @@ class NotebookLibrary:
             raise ValueError(f"Notebook not found: {notebook_id}")
 
         notebook = self.notebooks[notebook_id]
-        notebook['use_count'] += 1
-        notebook['last_used'] = datetime.now().isoformat()
-
-        self._save_library()
+        notebook['use_count'] = int(notebook.get('use_count') or 0) + 1
+        notebook['last_used'] = _now_iso()
+        self._stats_cache = None
+
+        # Uses are frequent: append one log line rather than rewrite library.json
+        if not self._read_only:
+            entry = {'id': notebook_id, 'ts': notebook['last_used']}
+            line = dumps(entry, indent=False) + b'\n'
+            self._log_uses[notebook_id] += 1
+            try:
+                with open(self.use_log_file, 'ab') as f:
+                    f.write(line)
+            except OSError as e:
+                debug(f"Use log not written, saving the library instead: {e}")
+                self._unlogged_uses.append((notebook_id, entry['ts']))
+                self._mark_dirty()
         return notebook
 
     def get_stats(self) -> Dict[str, Any]:
         """Get library statistics"""
-        total_notebooks = len(self.notebooks)
-        total_topics = set()
-        total_use_count = 0
-
-        for notebook in self.notebooks.values():
-            total_topics.update(notebook['topics'])
-            total_use_count += notebook['use_count']
-
-        # Find most used
-        most_used = None
-        if self.notebooks:
-            most_used = max(
-                self.notebooks.values(),
-                key=lambda n: n['use_count']
+        if self._topic_counts is None:
+            self._topic_counts = Counter(
+                topic for notebook in self.notebooks.values() for topic in notebook['topics']
             )
 
+        if self._stats_cache is None:
+            total_use_count = 0
+            most_used_id = None
+            most_used_count = -1
+
+            # One pass; the first notebook with the highest count wins, as max() would pick
+            for notebook_id, notebook in self.notebooks.items():
+                use_count = notebook['use_count']
+                total_use_count += use_count
+                if use_count > most_used_count:
+                    most_used_id, most_used_count = notebook_id, use_count
+
+            self._stats_cache = (total_use_count, most_used_id)
+
+        total_use_count, most_used_id = self._stats_cache
         return {
-            'total_notebooks': total_notebooks,
-            'total_topics': len(total_topics),
+            'total_notebooks': len(self.notebooks),
+            'total_topics': len(self._topic_counts),
             'total_use_count': total_use_count,
             'active_notebook': self.get_active_notebook(),
-            'most_used_notebook': most_used,
+            'most_used_notebook': self.notebooks.get(most_used_id) if most_used_id else None,
             'library_path': str(self.library_file)
         }
 
@@ -599,28 +1024,33 @@ class NotebookLibrary:
         """Format notebooks as a JSON export payload"""
         payload = {
             'export_version': '1.0',
-            'exported_at': datetime.now().isoformat(),
+            'exported_at': _now_iso(),
             'exported_by': 'notebooklm-experts/1.0',
             'notebooks': notebooks,
             'metadata': metadata,
         }
-        return json.dumps(payload, indent=2, ensure_ascii=False)
+        return dumps(payload).decode('utf-8')
 
     def _export_csv(self, notebooks: List[Dict]) -> str:
         """Format notebooks as CSV with semicolon-delimited list fields"""
+        # csv/io are imported on demand so list/search/stats never load them
+        import csv
+        import io
+
         output = io.StringIO()
         fieldnames = [
             'id', 'url', 'name', 'description', 'topics', 'tags',
             'content_types', 'use_cases', 'created_at', 'updated_at',
             'use_count', 'last_used',
         ]
-        writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore')
-        writer.writeheader()
-        for nb in notebooks:
-            row = dict(nb)
-            for field in ('topics', 'tags', 'content_types', 'use_cases'):
-                row[field] = ';'.join(nb.get(field) or [])
-            writer.writerow(row)
+        list_fields = set(CSV_LIST_FIELDS)
+        writer = csv.writer(output)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            [';'.join(nb.get(field) or ()) if field in list_fields else nb.get(field, '')
+             for field in fieldnames]
+            for nb in notebooks
+        )
         return output.getvalue()
 
     # ------------------------------------------------------------------ #
@@ -648,60 +1078,97 @@ class NotebookLibrary:
         fmt = self._detect_format(path)
 
         if fmt == 'json':
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if isinstance(data, dict) and 'notebooks' in data:
-                raw = data['notebooks']
-            elif isinstance(data, list):
-                raw = data
-            else:
-                raise ValueError("JSON must contain an object with 'notebooks' key or a root list")
+            raw = self._iter_json_notebooks(path)
         elif fmt == 'csv':
+            import csv
+
             raw = []
+            # Topic/tag names repeat across rows; interning keeps one copy of each
+            intern = sys.intern
             with open(path, 'r', encoding='utf-8', newline='') as f:
-                for row in csv.DictReader(f):
-                    for field in ('topics', 'tags', 'content_types', 'use_cases'):
-                        if field in row:
-                            row[field] = [v for v in row[field].split(';') if v]
-                    raw.append(dict(row))
+                reader = csv.DictReader(f)
+                list_fields = [field for field in CSV_LIST_FIELDS if field in (reader.fieldnames or ())]
+                for row in reader:
+                    for field in list_fields:
+                        value = row[field]
+                        row[field] = [intern(v) for v in value.split(';') if v] if value else []
+                    raw.append(row)
         else:
             raise ValueError(f"Unsupported import format: {fmt!r}")
 
         valid, errors = self._validate_import_notebooks(raw)
 
-        result: Dict[str, Any] = {
-            'imported': 0,
-            'skipped': 0,
-            'errors': errors,
-            'notebooks': [],
-        }
+        # One timestamp for the whole batch; (id, name, status) per row,
+        # expanded into result dicts once the loop is done
+        now_iso = _now_iso()
+        defaults = {'created_at': now_iso, 'updated_at': now_iso, 'use_count': 0, 'last_used': None}
+        outcomes: List[Tuple[str, str, str]] = []
+        imported = 0
 
         for nb in valid:
             nb_id = nb['id']
             if nb_id in self.notebooks:
                 if strategy == 'overwrite':
-                    nb['updated_at'] = datetime.now().isoformat()
+                    nb['updated_at'] = now_iso
                     self.notebooks[nb_id] = nb
-                    result['notebooks'].append({'id': nb_id, 'name': nb.get('name', ''), 'status': 'overwritten'})
-                    result['imported'] += 1
+                    outcomes.append((nb_id, nb.get('name', ''), 'overwritten'))
+                    imported += 1
                 else:  # merge: skip duplicates
-                    result['notebooks'].append({'id': nb_id, 'name': nb.get('name', ''), 'status': 'skipped', 'reason': 'already exists'})
-                    result['skipped'] += 1
+                    outcomes.append((nb_id, nb.get('name', ''), 'skipped'))
             else:
-                nb.setdefault('created_at', datetime.now().isoformat())
-                nb.setdefault('updated_at', datetime.now().isoformat())
-                nb.setdefault('use_count', 0)
-                nb.setdefault('last_used', None)
+                nb.update({k: v for k, v in defaults.items() if k not in nb})
                 self.notebooks[nb_id] = nb
-                result['notebooks'].append({'id': nb_id, 'name': nb.get('name', ''), 'status': 'imported'})
-                result['imported'] += 1
+                outcomes.append((nb_id, nb.get('name', ''), 'imported'))
+                imported += 1
+
+        result: Dict[str, Any] = {
+            'imported': imported,
+            'skipped': len(outcomes) - imported,
+            'errors': errors,
+            'notebooks': [
+                {'id': nb_id, 'name': name, 'status': status, 'reason': 'already exists'}
+                if status == 'skipped' else
+                {'id': nb_id, 'name': name, 'status': status}
+                for nb_id, name, status in outcomes
+            ],
+        }
 
         if result['imported']:
-            self._save_library()
+            # Overwrites can swap topics wholesale; recount on the next get_stats
+            self._topic_counts = None
+            self._mark_dirty()
 
         print(f"Import complete: {result['imported']} imported, {result['skipped']} skipped, {len(errors)} errors")
         return result
 
+    def _iter_json_notebooks(self, path: Path) -> Iterator[Dict]:
+        """Yield notebook objects from a JSON import file.
+
+        Streams them with ijson when it is installed, so a large export is
+        never held in memory as a whole. Without ijson, or when streaming
+        found no notebooks, the file is parsed in full so an unexpected
+        layout is still reported.
+        """
+        ijson = _ijson()
+        if ijson is not None:
+            with open(path, 'rb') as f:
+                prefix = 'item' if f.read(64).lstrip().startswith(b'[') else 'notebooks.item'
+                f.seek(0)
+                found = False
+                for nb in ijson.items(f, prefix, use_float=True):
+                    found = True
+                    yield nb
+            if found:
+                return
+
+        data = read_json(path)
+        if isinstance(data, dict) and 'notebooks' in data:
+            yield from data['notebooks']
+        elif isinstance(data, list):
+            yield from data
+        else:
+            raise ValueError("JSON must contain an object with 'notebooks' key or a root list")
+
     def _detect_format(self, file_path: Path) -> str:
         """Detect file format from extension"""
         suffix = file_path.suffix.lower()
@@ -790,6 +1257,8 @@ def main():
     import_parser.add_argument('--file', required=True, help='Path to import file (.json or .csv)')
     import_parser.add_argument('--strategy', choices=['merge', 'overwrite'], default='merge',
                                help='Conflict strategy: merge=skip existing, overwrite=replace (default: merge)')
+    import_parser.add_argument('--fetch-metadata', action='store_true',
+                               help='Fill empty topics/descriptions from the live notebook pages')
 
     # Add-source command
     add_source_parser = subparsers.add_parser('add-source', help='Add a web URL source to a notebook')
@@ -800,7 +1269,10 @@ def main():
     args = parser.parse_args(argv)
 
     # Initialize library
-    library = NotebookLibrary(profile_id=getattr(args, 'profile', None))
+    library = NotebookLibrary(
+        profile_id=getattr(args, 'profile', None),
+        read_only=args.command in ('list', 'search', 'stats', 'export'),
+    )
 
     # Execute command
     if args.command == 'add':
@@ -927,6 +1399,31 @@ def main():
             file_path=args.file,
             strategy=args.strategy,
         )
+
+        if args.fetch_metadata:
+            # Imported rows with no topics get them from their source lists,
+            # fetched together on one Chrome rather than one launch per URL
+            targets = [
+                library.notebooks[entry['id']]
+                for entry in result['notebooks']
+                if entry['status'] != 'skipped' and not library.notebooks[entry['id']].get('topics')
+            ]
+            if targets:
+                print(f"Auto-detecting metadata for {len(targets)} notebooks...")
+                metas = fetch_notebook_metadata_bulk(
+                    [nb['url'] for nb in targets],
+                    profile_id=getattr(args, 'profile', None),
+                )
+                for nb in targets:
+                    sources = [unquote(s) for s in metas.get(nb['url'], {}).get('sources', [])]
+                    if sources:
+                        library.update_notebook(
+                            nb['id'],
+                            topics=sources,
+                            description=None if nb.get('description') else
+                            f"Notebook with {len(sources)} sources: {', '.join(sources[:5])}",
+                        )
+
         print(json.dumps(result, indent=2))
 
     elif args.command == 'add-source':
@@ -948,6 +1445,8 @@ def main():
     else:
         parser.print_help()
 
+    library.flush()
+
 
 if __name__ == "__main__":
     main()
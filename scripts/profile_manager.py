@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 """Profile registry manager for NotebookLM skill workflows."""
 
-import json
+import os
 import shutil
+import threading
 import time
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from config import DATA_DIR
+from json_utils import read_json, write_json
 from runtime_logging import configure_runtime, extract_runtime_flags, runtime_options_help, step
 
 PROFILES_DIR = DATA_DIR / "profiles"
@@ -17,6 +19,17 @@ PROFILES_FILE = DATA_DIR / "profiles.json"
 # Auth expiry threshold in days
 AUTH_EXPIRY_DAYS = 7
 AUTH_WARNING_DAYS = 5
+# The same thresholds in seconds, so status checks compare ages without dividing
+_AUTH_EXPIRY_SECONDS = AUTH_EXPIRY_DAYS * 86400
+_AUTH_WARNING_SECONDS = AUTH_WARNING_DAYS * 86400
+
+
+def _move(src: Path, dst: Path):
+    """Rename src to dst in one syscall; copy across devices only if the rename fails."""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(str(src), str(dst))
 
 
 def _migrate_legacy_layout():
@@ -40,13 +53,13 @@ def _migrate_legacy_layout():
     default_dir.mkdir(parents=True, exist_ok=True)
 
     if legacy_browser_state.exists():
-        shutil.move(str(legacy_browser_state), str(default_dir / "browser_state"))
+        _move(legacy_browser_state, default_dir / "browser_state")
 
     if legacy_auth_info.exists():
-        shutil.move(str(legacy_auth_info), str(default_dir / "auth_info.json"))
+        _move(legacy_auth_info, default_dir / "auth_info.json")
 
     if legacy_library.exists():
-        shutil.move(str(legacy_library), str(default_dir / "library.json"))
+        _move(legacy_library, default_dir / "library.json")
 
     # Build initial profiles.json from migrated auth_info
     profile_entry = {
@@ -61,15 +74,13 @@ def _migrate_legacy_layout():
     migrated_auth = default_dir / "auth_info.json"
     if migrated_auth.exists():
         try:
-            with open(migrated_auth, "r") as f:
-                info = json.load(f)
+            info = read_json(migrated_auth)
             profile_entry["authenticated_at"] = info.get("authenticated_at")
         except Exception:
             pass
 
     registry = {"active_profile": "default", "profiles": [profile_entry]}
-    with open(PROFILES_FILE, "w") as f:
-        json.dump(registry, f, indent=2)
+    write_json(PROFILES_FILE, registry)
 
     print("  Migration complete → data/profiles/default/")
 
@@ -85,18 +96,22 @@ class ProfileManager:
 
     def _load(self):
         if PROFILES_FILE.exists():
-            with open(PROFILES_FILE, "r") as f:
-                data = json.load(f)
+            data = read_json(PROFILES_FILE)
             self.active_profile: Optional[str] = data.get("active_profile")
             self.profiles: List[Dict[str, Any]] = data.get("profiles", [])
         else:
             self.active_profile = None
             self.profiles = []
+        # Same entry dicts keyed by id; profiles stays the list that is saved
+        self._by_id: Dict[str, Dict[str, Any]] = {p["id"]: p for p in self.profiles}
+
+    def reload(self):
+        """Re-read profiles.json, e.g. after another process changed it."""
+        self._load()
 
     def _save(self):
         data = {"active_profile": self.active_profile, "profiles": self.profiles}
-        with open(PROFILES_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        write_json(PROFILES_FILE, data)
 
     # ── Path resolution ───────────────────────────────────────────────────
 
@@ -123,10 +138,7 @@ class ProfileManager:
     # ── CRUD ──────────────────────────────────────────────────────────────
 
     def _find(self, profile_id: str) -> Optional[Dict[str, Any]]:
-        for p in self.profiles:
-            if p["id"] == profile_id:
-                return p
-        return None
+        return self._by_id.get(profile_id)
 
     def create_profile(self, name: str) -> Dict[str, Any]:
         profile_id = name.lower().replace(" ", "-").replace("_", "-")
@@ -145,6 +157,7 @@ class ProfileManager:
             "last_validated": None,
         }
         self.profiles.append(entry)
+        self._by_id[profile_id] = entry
 
         if self.active_profile is None:
             self.active_profile = profile_id
@@ -164,6 +177,7 @@ class ProfileManager:
             shutil.rmtree(profile_dir)
 
         self.profiles = [p for p in self.profiles if p["id"] != profile_id]
+        del self._by_id[profile_id]
 
         if self.active_profile == profile_id:
             self.active_profile = self.profiles[0]["id"] if self.profiles else None
@@ -191,27 +205,29 @@ class ProfileManager:
     # ── Status helpers ────────────────────────────────────────────────────
 
     @staticmethod
-    def compute_status(profile: Dict[str, Any]) -> str:
+    def compute_status(profile: Dict[str, Any], now: Optional[float] = None) -> str:
         auth_at = profile.get("authenticated_at")
         if not auth_at:
             return "NOT_AUTHENTICATED"
-        age_days = (time.time() - auth_at) / 86400
-        if age_days > AUTH_EXPIRY_DAYS:
+        age = (time.time() if now is None else now) - auth_at
+        if age > _AUTH_EXPIRY_SECONDS:
             return "EXPIRED"
-        if age_days > AUTH_WARNING_DAYS:
+        if age > _AUTH_WARNING_SECONDS:
             return "EXPIRING_SOON"
         return "VALID"
 
     def list_profiles(self) -> List[Dict[str, Any]]:
         result = []
+        # One clock read for the whole listing
+        now = time.time()
         for p in self.profiles:
             info = dict(p)
-            info["status"] = self.compute_status(p)
+            info["status"] = self.compute_status(p, now)
             info["is_active"] = p["id"] == self.active_profile
 
             auth_at = p.get("authenticated_at")
             if auth_at:
-                age = (time.time() - auth_at) / 86400
+                age = (now - auth_at) / 86400
                 info["auth_age_days"] = round(age, 1)
                 info["expires_in_days"] = round(AUTH_EXPIRY_DAYS - age, 1)
             else:
@@ -248,6 +264,42 @@ class ProfileManager:
                 print(f"     Action: Run 'auth_manager.py reauth --profile {p['id']}'")
 
 
+# get_profile_manager()'s instance and the profiles.json (mtime_ns, size) it last read
+_SHARED_MANAGER: Optional[Tuple[ProfileManager, Optional[Tuple[int, int]]]] = None
+# Worker threads (debug_skill's parallel checks) may ask at once; one builds it
+_SHARED_MANAGER_LOCK = threading.Lock()
+
+
+def _registry_key() -> Optional[Tuple[int, int]]:
+    try:
+        st = PROFILES_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def get_profile_manager() -> ProfileManager:
+    """
+    Return the process-wide ProfileManager.
+
+    The first call pays for the migration check and the profiles.json read;
+    later calls stat the file and reload only if it changed on disk, so
+    saves from other instances or processes are still picked up.
+    """
+    global _SHARED_MANAGER
+    with _SHARED_MANAGER_LOCK:
+        if _SHARED_MANAGER is None:
+            pm = ProfileManager()
+        else:
+            pm, loaded_key = _SHARED_MANAGER
+            if _registry_key() == loaded_key:
+                return pm
+            pm.reload()
+        # Taken after loading: the migration may have just written profiles.json
+        _SHARED_MANAGER = (pm, _registry_key())
+        return pm
+
+
 def main():
     """Command-line interface for profile management."""
     import argparse
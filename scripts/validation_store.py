@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Validation state store for NotebookLM notebooks.
+
+Link-check results change far more often than notebook metadata, so they
+live in a small per-profile SQLite table instead of library.json: a
+validation run updates only the rows it checked, in one transaction,
+rather than rewriting the whole library.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS v (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    reason TEXT,
+    checked_at TEXT
+)
+"""
+
+
+class ValidationStore:
+    """Per-notebook validation results keyed by notebook id"""
+
+    def __init__(self, db_path: Path):
+        """Open (and create if needed) the store at db_path."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(_SCHEMA)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Return every stored result as {id: {status, reason, checked_at}}."""
+        rows = self.conn.execute("SELECT id, status, reason, checked_at FROM v")
+        return {
+            notebook_id: {'status': status, 'reason': reason, 'checked_at': checked_at}
+            for notebook_id, status, reason, checked_at in rows
+        }
+
+    def upsert_many(self, rows: Iterable[Tuple[str, str, str, str]]) -> None:
+        """Insert or update (id, status, reason, checked_at) rows in one commit."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO v (id, status, reason, checked_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET status = excluded.status, "
+                "reason = excluded.reason, checked_at = excluded.checked_at",
+                rows,
+            )
+
+    def prune(self, keep_ids: Collection[str]) -> None:
+        """Delete rows for notebooks not in keep_ids (removed from the library)."""
+        stale = [
+            (notebook_id,)
+            for (notebook_id,) in self.conn.execute("SELECT id FROM v")
+            if notebook_id not in keep_ids
+        ]
+        if stale:
+            with self.conn:
+                self.conn.executemany("DELETE FROM v WHERE id = ?", stale)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()